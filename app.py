@@ -1,15 +1,13 @@
 import os
+import re
 from dotenv import load_dotenv
-from cache import make_key, cache_get, cache_set
+from cache import make_key, cache_get, cache_set, record_materialized_lookup
+from cache import cache_exists
 from langchain_groq import ChatGroq
-from langchain_huggingface import HuggingFaceEmbeddings
 
-from neo4j import GraphDatabase
-from pymongo import MongoClient
 from typing import Annotated, Sequence, Literal
-from langchain_core.messages import BaseMessage, SystemMessage
+from langchain_core.messages import BaseMessage, SystemMessage, HumanMessage, AIMessage
 from langgraph.graph import StateGraph, END
-from langgraph.prebuilt import ToolNode
 from langchain_core.messages import ToolMessage
 from langchain_core.tools import tool
 from prometheus_client import Counter, start_http_server
@@ -17,11 +15,36 @@ from pydantic import BaseModel
 import operator
 import json
 from cache import init_semantic_cache, semantic_cache_get, semantic_cache_set
+from cache import set_cache_get, set_cache_set
+from cache import llm_cache_keys, llm_cache_get, llm_cache_set, LLM_CACHE_SEMANTIC
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnableConfig
 from langchain_core.output_parsers import JsonOutputParser
 import threading
+import time
+import uuid
+from functools import lru_cache
+import contextvars
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
 import metrics
-from metrics import TOOL_USAGE, REQUEST_LATENCY, ERROR_COUNT
+from metrics import TOOL_USAGE, REQUEST_LATENCY, ERROR_COUNT, PROMPT_TOKENS
+from metrics import LLM_CALLS_AVOIDED
+from neo4j_client import normalize_skill
+from role_matrix import ROLE_MATCH_ENGINE, get_role_matrix
+from role_match import match_roles, summarize_matches, ROLE_MATCH_TOP_K
+from intent_router import get_intent_router, log_decision
+from prefetch import Prefetcher
+from checkpointer import RedisCheckpointer
+from resilient_llm import ResilientLLM
+from skill_vectors import get_skill_table
+from job_search import (
+    embedding_model,
+    jobs_collection,
+    job_search_payload,
+    job_semantic_text,
+    missing_job_search_fields,
+    query_job_postings,
+)
 
 
 load_dotenv()
@@ -31,30 +54,50 @@ init_semantic_cache()
 threading.Thread(target=metrics.start_metrics, daemon=True).start()
 
 
-NEO4J_URI = os.getenv("NEO4J_URI")
-NEO4J_USER = os.getenv("NEO4J_USER")
-NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD")
-AUTH = (NEO4J_USER, NEO4J_PASSWORD)
+# Minimum Jaccard similarity for a cached skill set to answer role_match
+ROLE_MATCH_JACCARD = float(os.getenv("ROLE_MATCH_JACCARD", "0.8"))
 
-MONGO_CONNECTION_STRING = os.getenv("MONGO_CONNECTION_STRING")
+# Call find_best_role_match straight from the extracted skills, without the advisor hop
+ADVISOR_FAST_PATH = os.getenv("ADVISOR_FAST_PATH", "1") == "1"
 
-MONGO_DB = os.getenv("MONGO_DB", "jobportal")
+# Classify advisor-mode messages by embedding before deciding whether to run the extractor
+INTENT_ROUTER = os.getenv("INTENT_ROUTER", "1") == "1"
+# Intents that carry no skills: the extractor is skipped and the advisor answers directly
+NO_SKILL_INTENTS = {"confirmation", "logistics"}
 
-print("Loading Embeddings..")
+# Warm job_search caches for the identified role while the user is still typing
+JOB_PREFETCH = os.getenv("JOB_PREFETCH", "1") == "1"
+# (location, level) combinations warmed per prefetch when the user has not named both
+PREFETCH_MAX_COMBINATIONS = int(os.getenv("PREFETCH_MAX_COMBINATIONS", "4"))
+# How long search_mongodb_jobs waits on a warm-up of the same key still in flight
+PREFETCH_WAIT_SECONDS = float(os.getenv("PREFETCH_WAIT_SECONDS", "5"))
+JOB_DIMENSIONS_TTL = 3600
 
-embedding_model = HuggingFaceEmbeddings(
-    model_name="sentence-transformers/all-MiniLM-L6-v2"
-)
 
-print("Connecting to Databases...")
+@lru_cache(maxsize=256)
+def embed_text(text: str) -> list[float]:
+    """
+    embed_query memoized per text: the intent router, the extractor and the LLM
+    cache all embed the same user message. Callers must not mutate the result.
+    """
+    return embedding_model.embed_query(text)
 
-mongo_client = MongoClient(MONGO_CONNECTION_STRING)
-jobs_collection = mongo_client[MONGO_DB]["job_postings"]
+if ROLE_MATCH_ENGINE == "matrix":
+    print("Loading Role-Skill Matrix...")
+    get_role_matrix()
 
 
 llm_discovery = ChatGroq(model="llama-3.3-70b-versatile", temperature=0)
 llm_extract = ChatGroq(model="llama-3.1-8b-instant", temperature=0)
 
+# Per-call deadlines (seconds) of the ResilientLLM wrappers below
+LLM_DEADLINES = {
+    "advisor": float(os.getenv("LLM_DEADLINE_ADVISOR", "20")),
+    "scout": float(os.getenv("LLM_DEADLINE_SCOUT", "20")),
+    "extract": float(os.getenv("LLM_DEADLINE_EXTRACT", "10")),
+    "summary": float(os.getenv("LLM_DEADLINE_SUMMARY", "8")),
+}
+
 
 class CareerState(BaseModel):
     messages: Annotated[Sequence[BaseMessage], operator.add]
@@ -66,23 +109,62 @@ class CareerState(BaseModel):
 
     identified_role: str | None = None
 
+    # Label from the intent router for the latest message (None: unsure or not run)
+    intent: str | None = None
+
+    # Rolling summary of messages[:summarized_count], kept by manage_context
+    summary: str | None = None
+    summarized_count: int = 0
+
     active_agent: Literal["advisor", "scout"] = "advisor"
 
 
+def canonicalize_skills(skills: list[str]) -> list[str]:
+    """
+    Maps extracted skills onto ontology spellings so equivalent inputs share
+    cache keys and match Neo4j exactly. Falls back to the raw list on failure.
+    """
+    try:
+        return get_skill_table(embedding_model).canonicalize(skills)
+    except Exception as e:
+        ERROR_COUNT.labels(type="canonicalization").inc()
+        print(f"[Canonicalization Error] {e}")
+        return skills
+
+
 @tool
 def find_best_role_match(skills: list[str]) -> str:
     """
-    Finds the best Job Role by counting skill matches in Neo4j.
-    Uses Semantic Caching to handle variations in skill naming.
+    Finds the best Job Roles by counting skill matches in Neo4j.
+    Returns the best role plus alternatives, each with mandatory/optional skill
+    coverage and the required skills the user is missing.
+    Uses Set-Similarity and Semantic Caching to handle variations in skill lists.
     """
 
     TOOL_USAGE.labels(tool_name="find_best_role_match").inc()
 
     with REQUEST_LATENCY.labels(stage="neo4j_lookup").time():
+        skills = canonicalize_skills(skills)
         skills_text = ", ".join(sorted([s.strip() for s in skills]))
+        skill_tokens = {normalize_skill(s) for s in skills if s.strip()}
+
+        exact_key = make_key("role_match", {"skills": sorted(skills)})
+        if exact_match := cache_get(exact_key):
+            return json.dumps(exact_match)
+
+        # Skill lists are sets: compare them as sets (Jaccard) before paying for an embedding
+        cached_result = set_cache_get(
+            skill_tokens, category="role_match", threshold=ROLE_MATCH_JACCARD
+        )
+        if cached_result and "role_name" in cached_result:
+            print(f"[SET HIT] role_match for '{skills_text}'")
+            cache_set(exact_key, cached_result, ttl=3600)
+            return json.dumps(cached_result)
 
         try:
-            query_vector = embedding_model.embed_query(skills_text)
+            # The 0.1 threshold below is tuned for embeddings of the joined skill text;
+            # mean-pooled skill vectors sit far closer together and would collide
+            query_vector = embed_text(skills_text)
         except Exception as e:
             return json.dumps({"error": f"Embedding failed: {str(e)}"})
 
@@ -95,53 +177,34 @@ def find_best_role_match(skills: list[str]) -> str:
         if cached_result and "role_name" in cached_result:
             # CACHE_HITS.labels(layer="semantic").inc()
             print(f"[SEMANTIC HIT] role_match for '{skills_text}'")
+            cache_set(exact_key, cached_result, ttl=3600)
             return json.dumps(cached_result)
 
-        exact_key = make_key("role_match", {"skills": sorted(skills)})
-        if cache_get(exact_key):
-            # CACHE_HITS.labels(layer="exact").inc()
-            return json.dumps(cache_get(exact_key))
-
         # CACHE_MISSES.labels(layer="role_match").inc()
         print(f"[CACHE MISS] role_match for '{skills_text}'")
 
-        driver = GraphDatabase.driver(NEO4J_URI, auth=AUTH)
-
-        cypher_query = """
-        UNWIND $skills AS user_skill
-        MATCH (r:Role)-[:REQUIRES|RECOMMENDS]-(s:Skill)
-        WHERE toLower(s.name) = toLower(user_skill)
-        WITH r, count(s) AS match_count, collect(s.name) AS matched_skills
-        ORDER BY match_count DESC LIMIT 1
-        RETURN r.name AS role_name, r.description AS description, match_count, matched_skills
-        """
         try:
-            with driver.session(database="neo4j") as session:
-                result = session.run(cypher_query, skills=skills)
-                records = list(result)
+            if ROLE_MATCH_ENGINE == "matrix":
+                matches = get_role_matrix().top_k(skills, k=ROLE_MATCH_TOP_K)
+            else:
+                matches = match_roles(skills, k=ROLE_MATCH_TOP_K)
 
-            if not records:
+            if not matches:
                 return json.dumps({"error": "No matching role found."})
 
-            record = records[0]
-
-            result = {
-                "role_name": record["role_name"],
-                "description": record["description"],
-                "match_score": record["match_count"],
-                "matched_skills": record["matched_skills"],
-            }
+            # Best role, alternatives and skill gaps travel (and are cached) together
+            result = summarize_matches(matches)
 
             semantic_cache_set(skills_text, query_vector, result, category="role_match")
+            set_cache_set(skill_tokens, result, category="role_match")
 
             cache_set(exact_key, result, ttl=3600)
 
             return json.dumps(result)
 
         except Exception as e:
+            ERROR_COUNT.labels(type="neo4j").inc()
             return json.dumps({"error": str(e)})
-        finally:
-            driver.close()
 
 
 @tool
@@ -155,33 +218,30 @@ def search_mongodb_jobs(
 
     TOOL_USAGE.labels(tool_name="search_mongodb_jobs").inc()
 
-    missing_fields = []
-    if not location or location.lower() in ["unknown", "none", ""]:
-        missing_fields.append("Location")
-
-    if not experience_level or experience_level.lower() in ["unknown", "none", ""]:
-        missing_fields.append("Experience Level")
-
+    missing_fields = missing_job_search_fields(location, experience_level)
     if missing_fields:
         return f"STOP: You cannot search yet. The user has not provided: {', '.join(missing_fields)}. Ask the user for this information."
 
     # STANDARD CACHE
-    payload = {
-        "job_title": job_title.strip().lower(),
-        "location": location.strip().lower(),
-        "experience_level": experience_level.strip().lower(),
-    }
+    payload = job_search_payload(job_title, location, experience_level)
 
     exact_key = make_key("job_search", payload)
 
-    if exact_match := cache_get(exact_key):
+    exact_match = cache_get(exact_key)
+    if exact_match is None and job_prefetcher.wait(exact_key, PREFETCH_WAIT_SECONDS):
+        exact_match = cache_get(exact_key)
+
+    if exact_match:
         print(f"[EXACT HIT] job_search for {payload}")
+        record_materialized_lookup(exact_key, hit=True)
+        job_prefetcher.claim(exact_key)
         return json.dumps(exact_match)
 
     print(f"[EXACT MISS] job_search for {payload}")
+    record_materialized_lookup(exact_key, hit=False)
 
     # SEMANTIC CACHE
-    semantic_query = f"{job_title} {location} {experience_level}".strip().lower()
+    semantic_query = job_semantic_text(job_title, location, experience_level)
 
     query_vector = embedding_model.embed_query(semantic_query)
 
@@ -200,80 +260,7 @@ def search_mongodb_jobs(
             f"Scout Debug: Searching for '{job_title}' in '{location}' ({experience_level})"
         )
 
-        with REQUEST_LATENCY.labels(stage="mongo_lookup").time():
-            query_text = f"{location} {experience_level} {job_title}"
-
-            query_embedding = embedding_model.embed_query(query_text)
-
-            pipeline = [
-                {
-                    "$vectorSearch": {
-                        "index": "job_vector_index",
-                        "path": "embedding",
-                        "queryVector": query_embedding,
-                        "numCandidates": 100,
-                        "limit": 50,
-                    }
-                }
-            ]
-
-            match_conditions = []
-            if location:
-                match_conditions.append(
-                    {"location": {"$regex": location, "$options": "i"}}
-                )
-            if experience_level:
-                match_conditions.append(
-                    {"experience_level": {"$regex": experience_level, "$options": "i"}}
-                )
-
-            if match_conditions:
-                pipeline.append({"$match": {"$and": match_conditions}})
-
-            pipeline.extend(
-                [
-                    {"$addFields": {"score": {"$meta": "vectorSearchScore"}}},
-                    {
-                        "$project": {
-                            "_id": 0,
-                            "job_title": 1,
-                            "company": 1,
-                            "location": 1,
-                            "salary_range": 1,
-                            "score": 1,
-                        }
-                    },
-                    {"$limit": 5},
-                ]
-            )
-
-            results = list(jobs_collection.aggregate(pipeline))
-
-            if not results:
-                print("Vector search yielded 0 results. Switching to Regex Fallback...")
-                query = {}
-                if job_title and "anything" not in job_title.lower():
-                    query["job_title"] = {"$regex": job_title, "$options": "i"}
-                if location:
-                    query["location"] = {"$regex": location, "$options": "i"}
-                if experience_level:
-                    query["experience_level"] = {
-                        "$regex": experience_level,
-                        "$options": "i",
-                    }
-
-                results = list(
-                    jobs_collection.find(
-                        query,
-                        {
-                            "_id": 0,
-                            "job_title": 1,
-                            "company": 1,
-                            "location": 1,
-                            "salary_range": 1,
-                        },
-                    ).limit(5)
-                )
+        results = query_job_postings(job_title, location, experience_level)
 
         if not results:
             return json.dumps({"message": "No jobs found matching your criteria."})
@@ -288,6 +275,147 @@ def search_mongodb_jobs(
         return json.dumps({"error": str(e)})
 
 
+job_prefetcher = Prefetcher()
+_job_dimensions = {"loaded_at": 0.0, "locations": [], "levels": []}
+
+
+def _distinct_values(field: str) -> list[str]:
+    values = jobs_collection.distinct(field)
+    return sorted({v.strip() for v in values if isinstance(v, str) and v.strip()})
+
+
+def job_dimensions() -> tuple[list[str], list[str]]:
+    """
+    Distinct locations and experience levels in job_postings, refreshed hourly.
+    """
+    if time.monotonic() - _job_dimensions["loaded_at"] > JOB_DIMENSIONS_TTL:
+        _job_dimensions["locations"] = _distinct_values("location")
+        _job_dimensions["levels"] = _distinct_values("experience_level")
+        _job_dimensions["loaded_at"] = time.monotonic()
+    return _job_dimensions["locations"], _job_dimensions["levels"]
+
+
+def mentioned(text: str, values: list[str]) -> str | None:
+    """
+    The value (or, for "City, Country", its city) named last in text.
+    """
+    best, best_at = None, -1
+    for value in values:
+        for name in {value, value.split(",")[0].strip()}:
+            for found in re.finditer(rf"\b{re.escape(name.lower())}\b", text):
+                if found.start() > best_at:
+                    best, best_at = value, found.start()
+    return best
+
+
+def job_candidate_pairs(role: str, location: str | None, level: str | None) -> list:
+    """
+    (location, level) combinations the scout is likely to search for the role:
+    the ones the user named, completed by the most common postings for the role.
+    """
+    if location and level:
+        return [(location, level)]
+
+    match = {"job_title": {"$regex": re.escape(role), "$options": "i"}}
+    if location:
+        match["location"] = location
+    if level:
+        match["experience_level"] = level
+
+    pipeline = [
+        {"$match": match},
+        {
+            "$group": {
+                "_id": {"location": "$location", "level": "$experience_level"},
+                "count": {"$sum": 1},
+            }
+        },
+        {"$sort": {"count": -1}},
+        {"$limit": PREFETCH_MAX_COMBINATIONS},
+    ]
+    return [
+        (row["_id"]["location"], row["_id"]["level"])
+        for row in jobs_collection.aggregate(pipeline)
+        if row["_id"].get("location") and row["_id"].get("level")
+    ]
+
+
+def location_forms(location: str) -> list[str]:
+    """
+    The stored location and its city alone ("Bucharest, Romania", "Bucharest"):
+    the scout passes whichever one the user typed.
+    """
+    city = location.split(",")[0].strip()
+    return [location] if not city or city == location else [location, city]
+
+
+def warm_job_search(role: str, location: str, level: str):
+    """
+    What search_mongodb_jobs would store for (role, location, level), written ahead
+    under every form of the location. One Mongo query serves all of them.
+    """
+    keys = {
+        form: make_key("job_search", job_search_payload(role, form, level))
+        for form in location_forms(location)
+    }
+    claimed = [form for form, key in keys.items() if job_prefetcher.begin(key)]
+    if not claimed:
+        return
+
+    written = set()
+    try:
+        pending = [form for form in claimed if not cache_exists(keys[form])]
+        if not pending:
+            return
+        results = query_job_postings(role, location, level)
+        if results:
+            semantic_query = job_semantic_text(role, location, level)
+            query_vector = embedding_model.embed_query(semantic_query)
+            semantic_cache_set(
+                semantic_query, query_vector, results, category="job_search"
+            )
+            for form in pending:
+                cache_set(keys[form], results, ttl=3600)
+                written.add(form)
+            print(f"[PREFETCH] Warmed job_search for {role} / {location} / {level}")
+    except Exception as e:
+        ERROR_COUNT.labels(type="prefetch").inc()
+        print(f"[PREFETCH] {role} / {location} / {level} failed: {e}")
+    finally:
+        for form in claimed:
+            job_prefetcher.finish(keys[form], form in written)
+
+
+def prefetch_job_searches(thread_id: str | None, role: str, text: str):
+    locations, levels = job_dimensions()
+    location, level = mentioned(text, locations), mentioned(text, levels)
+
+    # Same session, same (role, location, level): already warmed, skip the aggregation
+    if thread_id and not job_prefetcher.retarget(thread_id, (role, location, level)):
+        return
+
+    for pair_location, pair_level in job_candidate_pairs(role, location, level):
+        warm_job_search(role, pair_location, pair_level)
+
+
+def prefetch_jobs(role: str | None, messages: list, config: RunnableConfig = None):
+    """
+    Speculative job_search warm-up for the identified role, in the background.
+    Locations and levels the user mentioned narrow it down; it never blocks the turn.
+    Runs again for a session only once its (role, location, level) changes.
+    """
+    if not JOB_PREFETCH or not role:
+        return
+
+    text = " ".join(
+        m.content.lower()
+        for m in messages
+        if isinstance(m, HumanMessage) and isinstance(m.content, str)
+    )
+    thread_id = (config or {}).get("configurable", {}).get("thread_id")
+    job_prefetcher.submit(prefetch_job_searches, thread_id, role, text)
+
+
 EXTRACT_PROMPT = """
 You are an expert Resume Parser. 
 Extract the technical skills from the user's input below.
@@ -310,7 +438,9 @@ INSTRUCTIONS:
 1. Call `find_best_role_match`.
 2. If the tool returns a match (even with a low score), explain *why* it matched (e.g. "You matched 3 out of 4 skills for Data Scientist").
     - clearly state the **Role Name** and **Description** found.
-   - explain the match strength (e.g., "Matched 3/4 skills").
+   - explain the match strength using `mandatory_coverage` and `optional_coverage` (e.g., "You cover 75% of the required skills").
+   - list the `missing_skills` the user would need to learn for this role.
+   - briefly mention the `alternatives` (role name and coverage) in one or two lines, so the user does not need to ask for them.
    - **CRITICAL:** You MUST ask the user for confirmation. End your response with: "Does this role sound like the right direction for you?"
 3. If the user confirms, say "HANDOFF_TO_SCOUT.
 
@@ -347,8 +477,23 @@ When a tool returns JSON:
 - Do NOT show raw JSON
 """
 
-advisor_model = llm_discovery.bind_tools([find_best_role_match])
-scout_model = llm_discovery.bind_tools([search_mongodb_jobs])
+# 70B first, hedged past its p95, with the 8B model as fallback when the deadline nears
+advisor_model = ResilientLLM(
+    "advisor",
+    llm_discovery.bind_tools([find_best_role_match]),
+    fallback=llm_extract.bind_tools([find_best_role_match]),
+    deadline=LLM_DEADLINES["advisor"],
+)
+scout_model = ResilientLLM(
+    "scout",
+    llm_discovery.bind_tools([search_mongodb_jobs]),
+    fallback=llm_extract.bind_tools([search_mongodb_jobs]),
+    deadline=LLM_DEADLINES["scout"],
+)
+# Already the small model: deadline and hedging only
+extract_model = ResilientLLM("extract", llm_extract, deadline=LLM_DEADLINES["extract"])
+# Its own latency history: summaries are longer calls than extractions
+summary_model = ResilientLLM("summary", llm_extract, deadline=LLM_DEADLINES["summary"])
 
 
 extract_parser = JsonOutputParser()
@@ -362,7 +507,7 @@ def extract_skills_with_semantic_cache(user_input: str):
     """
 
     try:
-        query_vector = embedding_model.embed_query(user_input)
+        query_vector = embed_text(user_input)
     except Exception as e:
         print(f"[Extraction Error] Embedding failed: {e}")
         return []
@@ -387,7 +532,7 @@ def extract_skills_with_semantic_cache(user_input: str):
     prompt = ChatPromptTemplate.from_template(EXTRACT_PROMPT)
 
     # LLM extracts skills form the promt and parses the result
-    chain = prompt | llm_extract | extract_parser
+    chain = prompt | extract_model | extract_parser
 
     try:
         result = chain.invoke({"input": user_input})
@@ -403,6 +548,32 @@ def extract_skills_with_semantic_cache(user_input: str):
         return []
 
 
+def run_intent_router(state: CareerState):
+    """
+    Nearest-centroid intent of the latest message, on its MiniLM embedding.
+    Confirmations and logistics answers skip the extractor (and its LLM call);
+    skill descriptions and anything the router is unsure about still go there.
+    """
+    text = state.messages[-1].content if state.messages else ""
+    try:
+        intent, score, margin = get_intent_router(embedding_model).classify(
+            embed_text(text)
+        )
+    except Exception as e:
+        ERROR_COUNT.labels(type="intent_router").inc()
+        print(f"[Intent Router Error] {e}")
+        return {"intent": None}
+
+    if intent in NO_SKILL_INTENTS:
+        log_decision(text, intent, score, margin, route="advisor")
+        LLM_CALLS_AVOIDED.labels(reason="intent_router").inc()
+        # What run_extractor returns for a message without skills
+        return {"intent": intent, "current_skills": []}
+
+    log_decision(text, intent, score, margin, route="extractor")
+    return {"intent": intent}
+
+
 def run_extractor(state: CareerState):
     """
     Entry Point Node.
@@ -420,6 +591,7 @@ def run_extractor(state: CareerState):
         extracted_skills = extract_skills_with_semantic_cache(user_text)
 
         if extracted_skills:
+            extracted_skills = canonicalize_skills(extracted_skills)
             print(f"Skills Extracted: {extracted_skills}")
 
             return {"current_skills": extracted_skills}
@@ -430,6 +602,187 @@ def run_extractor(state: CareerState):
 extract_parser = JsonOutputParser()
 
 
+# Turns (a HumanMessage and everything up to the next one) the agents see verbatim.
+# Past CONTEXT_MAX_TURNS the oldest are folded into the summary until
+# CONTEXT_KEEP_TURNS remain, so the summarizer runs every few turns, not every turn.
+CONTEXT_KEEP_TURNS = max(1, int(os.getenv("CONTEXT_KEEP_TURNS", "4")))
+CONTEXT_MAX_TURNS = max(CONTEXT_KEEP_TURNS, int(os.getenv("CONTEXT_MAX_TURNS", "8")))
+CONTEXT_SUMMARY_WORDS = int(os.getenv("CONTEXT_SUMMARY_WORDS", "200"))
+CONTEXT_SUMMARY_TTL = int(os.getenv("CONTEXT_SUMMARY_TTL", "86400"))
+
+SUMMARY_PROMPT = """
+You maintain the running summary of a career guidance conversation.
+Update the current summary with the new conversation turns below.
+Keep the user's goals, preferences, constraints, decisions and open questions.
+Leave out the skills list, the identified role, the location and the experience level; they are tracked separately.
+Return only the updated summary, in plain text, at most {max_words} words.
+
+Current summary:
+{summary}
+
+New turns:
+{transcript}
+"""
+
+summary_prompt = ChatPromptTemplate.from_template(SUMMARY_PROMPT)
+
+
+def record_prompt_tokens(agent: str, response):
+    usage = getattr(response, "usage_metadata", None) or {}
+    if usage.get("input_tokens"):
+        PROMPT_TOKENS.labels(agent=agent).observe(usage["input_tokens"])
+
+
+def fold_range(state: CareerState) -> tuple[int, int] | None:
+    """
+    (start, end) of the messages to fold into the summary, or None while the
+    verbatim window is short enough. Cuts fall on HumanMessages, so a tool
+    call is never separated from its results.
+    """
+    starts = [
+        i
+        for i, message in enumerate(state.messages)
+        if i >= state.summarized_count and isinstance(message, HumanMessage)
+    ]
+    if len(starts) <= CONTEXT_MAX_TURNS:
+        return None
+    return state.summarized_count, starts[-CONTEXT_KEEP_TURNS]
+
+
+def render_transcript(messages: list) -> str:
+    """
+    Turns as plain text for the summarizer. Tool output is left out: what the
+    agents need from it is already in identified_role and current_skills.
+    """
+    lines = []
+    for message in messages:
+        if isinstance(message, HumanMessage):
+            lines.append(f"User: {message.content}")
+        elif isinstance(message, ToolMessage):
+            lines.append(f"[{message.name} returned its result]")
+        elif message.content:
+            lines.append(f"Assistant: {message.content}")
+
+        for call in getattr(message, "tool_calls", None) or []:
+            args = json.dumps(call["args"])
+            lines.append(f"[Assistant called {call['name']}({args})]")
+    return "\n".join(lines)
+
+
+def summary_inputs(state: CareerState, start: int, end: int) -> tuple[str, dict]:
+    """
+    Prompt inputs for folding messages[start:end], and the cache key they map to.
+    """
+    inputs = {
+        "summary": state.summary or "(none yet)",
+        "transcript": render_transcript(state.messages[start:end]),
+        "max_words": CONTEXT_SUMMARY_WORDS,
+    }
+    return make_key("context_summary", inputs), inputs
+
+
+def context_update(summary: str | None, end: int) -> dict:
+    if not summary:
+        return {}  # nothing folded; the history stays verbatim and is retried next turn
+
+    print(f"[CONTEXT] Summarized the first {end} messages")
+    return {"summary": summary, "summarized_count": end}
+
+
+def manage_context(state: CareerState, config: RunnableConfig):
+    """
+    Context manager node: keeps the last turns verbatim and folds older ones
+    into state.summary, written by summary_model and cached in Redis.
+    Every turn passes here first, so it also restarts the job prefetch.
+    """
+    prefetch_jobs(state.identified_role, recent_messages(state), config)
+
+    fold = fold_range(state)
+    if fold is None:
+        return {}
+
+    try:
+        key, inputs = summary_inputs(state, *fold)
+        summary = cache_get(key)
+        if summary is None:
+            with REQUEST_LATENCY.labels(stage="context_summary").time():
+                response = summary_model.invoke(
+                    summary_prompt.format_messages(**inputs)
+                )
+            record_prompt_tokens("summary", response)
+            summary = response.content.strip()
+            if summary:
+                cache_set(key, summary, ttl=CONTEXT_SUMMARY_TTL)
+    except Exception as e:
+        ERROR_COUNT.labels(type="context_summary").inc()
+        print(f"[Context Error] Summarization failed: {e}")
+        return {}
+
+    return context_update(summary, fold[1])
+
+
+def context_note(state: CareerState) -> str:
+    """
+    The summary and the facts already captured in state, for the system prompt.
+    Empty until something has been summarized.
+    """
+    if not state.summarized_count:
+        return ""
+
+    facts = {
+        "Career goal": state.career_goal,
+        "Skills": ", ".join(state.current_skills or []),
+        "Identified role": state.identified_role,
+        "Experience level": state.experience_level,
+        "Location": state.location,
+    }
+    known = "\n".join(f"- {name}: {value}" for name, value in facts.items() if value)
+
+    note = f"\n\nSUMMARY OF THE EARLIER CONVERSATION:\n{state.summary}"
+    if known:
+        note += f"\n\nKNOWN SO FAR:\n{known}"
+    return note
+
+
+def recent_messages(state: CareerState) -> list:
+    return list(state.messages[state.summarized_count :])
+
+
+def llm_call_keys(agent: str, model, messages: list) -> tuple[str, str]:
+    model = getattr(model, "primary", model)  # ResilientLLM: key on the main model
+    llm = model.bound
+    return llm_cache_keys(
+        agent,
+        messages,
+        model.kwargs.get("tools", []),
+        {"model": llm.model_name, "temperature": llm.temperature},
+    )
+
+
+def invoke_cached(agent: str, model, messages: list):
+    """
+    model.invoke through the LLM response cache in cache.py.
+    The key covers the messages, the bound tools and the model parameters.
+    """
+    keys = llm_call_keys(agent, model, messages)
+
+    query_text = query_vector = None
+    if LLM_CACHE_SEMANTIC and isinstance(messages[-1], HumanMessage):
+        query_text = messages[-1].content
+        query_vector = embed_text(query_text)
+
+    if cached := llm_cache_get(keys, query_vector):
+        return cached
+
+    response = model.invoke(messages)
+    record_prompt_tokens(agent, response)
+    if response.response_metadata.get("fallback"):
+        return response  # not what the primary model would have said
+    if response.content or response.tool_calls:
+        llm_cache_set(keys, agent, response, query_text, query_vector)
+    return response
+
+
 def run_advisor(state: CareerState):
     """
     Agent 1: Handles Skill -> Role mapping.
@@ -440,6 +793,15 @@ def run_advisor(state: CareerState):
 
     print("--- Advisor Agent Running ---")
 
+    response = invoke_cached("advisor", advisor_model, advisor_messages(state))
+    return advisor_update(response)
+
+
+def advisor_messages(state: CareerState) -> list:
+    """
+    System prompt (with the extracted skills, if any) followed by the history.
+    Turns folded into the summary are replaced by context_note.
+    """
     existing_skills = state.current_skills or []
 
     if existing_skills and len(existing_skills) > 0:
@@ -459,9 +821,28 @@ def run_advisor(state: CareerState):
     else:
         system_context = ADVISOR_PROMPT
 
-    messages = [SystemMessage(content=system_context)] + state.messages
-    response = advisor_model.invoke(messages)
+    system_context += context_note(state)
+    return [SystemMessage(content=system_context)] + recent_messages(state)
+
+
+def run_fast_path(state: CareerState):
+    """
+    Stands in for the first advisor hop when the extractor found skills: that
+    hop can only call find_best_role_match with them, so the tool call is
+    written directly and the advisor LLM runs once, to explain the result.
+    """
+    print("--- Fast Path: find_best_role_match without the advisor LLM ---")
+    LLM_CALLS_AVOIDED.labels(reason="fast_path").inc()
+
+    call = {
+        "name": "find_best_role_match",
+        "args": {"skills": state.current_skills},
+        "id": f"call_{uuid.uuid4().hex[:24]}",
+    }
+    return {"messages": [AIMessage(content="", tool_calls=[call])]}
+
 
+def advisor_update(response) -> dict:
     next_agent = "advisor"
     if "HANDOFF_TO_SCOUT" in response.content:
         response.content = response.content.replace("HANDOFF_TO_SCOUT", "").strip()
@@ -476,30 +857,117 @@ def run_scout(state: CareerState):
     """
     print("--- Scout Agent Running ---")
 
+    response = invoke_cached("scout", scout_model, scout_messages(state))
+
+    return {
+        "messages": [response],
+        "active_agent": "scout",  # Stays here
+    }
+
+
+def scout_messages(state: CareerState) -> list:
     print(state.identified_role)
     role = state.identified_role or "Software Engineer"  # Fallback
     formatted_prompt = SCOUT_PROMPT.format(identified_role=role)
 
-    messages = [SystemMessage(content=formatted_prompt)] + state.messages
+    formatted_prompt += context_note(state)
+    return [SystemMessage(content=formatted_prompt)] + recent_messages(state)
 
-    response = scout_model.invoke(messages)
 
-    return {
-        "messages": [response],
-        "active_agent": "scout",  # Stays here
-    }
+# Built once: every tool call of a turn is dispatched concurrently on this pool
+TOOLS = {t.name: t for t in [find_best_role_match, search_mongodb_jobs]}
+TOOL_POOL_SIZE = int(os.getenv("TOOL_POOL_SIZE", "8"))
+tool_pool = ThreadPoolExecutor(max_workers=TOOL_POOL_SIZE, thread_name_prefix="tool")
+
+TOOL_TIMEOUTS = {
+    "find_best_role_match": float(os.getenv("TOOL_TIMEOUT_ROLE_MATCH", "15")),
+    "search_mongodb_jobs": float(os.getenv("TOOL_TIMEOUT_JOB_SEARCH", "20")),
+}
+
+
+def tool_error(call: dict, error: str) -> ToolMessage:
+    return ToolMessage(
+        content=json.dumps({"error": error}), name=call["name"], tool_call_id=call["id"]
+    )
 
 
-def handle_tool_call(state: CareerState):
+def start_tool(call: dict, config: RunnableConfig) -> tuple[Future, list]:
+    """
+    Submits one tool call with the node's config (callbacks, tracing) and its
+    context. The returned list receives the time the call actually starts.
+    """
+    begun = []
+    tool = TOOLS[call["name"]]
+    context = contextvars.copy_context()
+
+    def run():
+        begun.append(time.monotonic())
+        return context.run(tool.invoke, call["args"], config)
+
+    return tool_pool.submit(run), begun
+
+
+def tool_result(future: Future, begun: list, timeout: float):
+    """
+    Waits for a tool call under a deadline counted from when it started
+    running, so time spent queued behind other sessions' calls is not charged.
+    """
+    while True:
+        remaining = begun[0] + timeout - time.monotonic() if begun else timeout
+        try:
+            return future.result(timeout=max(0.0, remaining))
+        except FutureTimeout:
+            if begun and time.monotonic() >= begun[0] + timeout:
+                raise
+
+
+def handle_tool_call(state: CareerState, config: RunnableConfig):
     """
     Custom Tool Node: Executes tools AND updates 'identified_role' in state.
+    All tool calls of the last AIMessage run concurrently, each under its own
+    timeout; results are merged back in call order.
     """
+    calls = getattr(state.messages[-1], "tool_calls", None) or []
+
+    started = [
+        start_tool(call, config) if call["name"] in TOOLS else None for call in calls
+    ]
+
+    new_messages = []
+    for call, submitted in zip(calls, started):
+        if submitted is None:
+            new_messages.append(tool_error(call, f"Unknown tool: {call['name']}"))
+            continue
 
-    tool_node = ToolNode([find_best_role_match, search_mongodb_jobs])
-    result = tool_node.invoke(state)  # Returns {"messages": [ToolMessage, ...]}
+        future, begun = submitted
+        timeout = TOOL_TIMEOUTS.get(call["name"], 30.0)
+        try:
+            content = tool_result(future, begun, timeout)
+            new_messages.append(
+                ToolMessage(content=content, name=call["name"], tool_call_id=call["id"])
+            )
+        except FutureTimeout:
+            # Only drops a call still queued; a running one ends at its own
+            # server-side query limit (MONGO_MAX_TIME_MS, NEO4J_QUERY_TIMEOUT)
+            future.cancel()
+            ERROR_COUNT.labels(type="tool_timeout").inc()
+            print(f"[TOOL TIMEOUT] {call['name']} exceeded {timeout}s")
+            new_messages.append(tool_error(call, f"{call['name']} timed out after {timeout}s"))
+        except Exception as e:
+            ERROR_COUNT.labels(type="tool").inc()
+            new_messages.append(tool_error(call, str(e)))
+
+    update = tool_state_update(new_messages)
+    if "identified_role" in update:
+        # The advisor now asks for confirmation; warm the scout's searches meanwhile
+        prefetch_jobs(update["identified_role"], recent_messages(state), config)
+    return update
 
-    new_messages = result["messages"]
 
+def tool_state_update(new_messages: list) -> dict:
+    """
+    Tool results for the history, plus 'identified_role' from find_best_role_match.
+    """
     state_update = {"messages": new_messages}
 
     for message in new_messages:
@@ -519,6 +987,20 @@ def handle_tool_call(state: CareerState):
     return state_update
 
 
+def route_intent(state: CareerState):
+    if state.intent in NO_SKILL_INTENTS:
+        return "advisor"
+
+    return "extractor"
+
+
+def route_extractor(state: CareerState):
+    if ADVISOR_FAST_PATH and state.current_skills and not state.identified_role:
+        return "fast_path"
+
+    return "advisor"
+
+
 def route_advisor(state):
     if not state.messages:
         return END
@@ -556,42 +1038,87 @@ def route_entry(state: CareerState):
     if state.active_agent == "scout":
         return "scout"
 
+    if INTENT_ROUTER:
+        return "intent"
+
     return "extractor"
 
 
-workflow = StateGraph(CareerState)
+def build_graph(context, extractor, advisor, scout, tools, checkpointer=None):
+    """
+    Wires the agent graph around the given node functions, so the sync graph
+    below and the async one in app_async.py share the same routing.
+    With a checkpointer, callers pass a thread_id and only the new message.
+    """
+    workflow = StateGraph(CareerState)
+
+    workflow.add_node("context", context)
+    workflow.add_node("extractor", extractor)
+    workflow.add_node("advisor", advisor)
+    workflow.add_node("scout", scout)
+    workflow.add_node("tools", tools)
+    # Sync and side-effect free, so it serves the async graph as well
+    workflow.add_node("fast_path", run_fast_path)
+    workflow.add_node("intent", run_intent_router)
+
+    # workflow.set_entry_point("extractor")
+
+    # Every turn starts by bounding the history, then routes as before
+    workflow.set_entry_point("context")
+    workflow.add_conditional_edges(
+        "context",
+        route_entry,
+        {
+            "intent": "intent",
+            "extractor": "extractor",
+            "scout": "scout",
+        },
+    )
 
+    workflow.add_conditional_edges(
+        "intent",
+        route_intent,
+        {
+            "extractor": "extractor",
+            "advisor": "advisor",
+        },
+    )
 
-workflow.add_node("extractor", run_extractor)
-workflow.add_node("advisor", run_advisor)
-workflow.add_node("scout", run_scout)
-workflow.add_node("tools", handle_tool_call)
+    workflow.add_conditional_edges(
+        "extractor",
+        route_extractor,
+        {
+            "fast_path": "fast_path",
+            "advisor": "advisor",
+        },
+    )
+    workflow.add_edge("fast_path", "tools")
+
+    workflow.add_conditional_edges(
+        "advisor",
+        route_advisor,
+        {
+            "tools": "tools",
+            "scout": "scout",
+            END: END,
+        },
+    )
 
-# workflow.set_entry_point("extractor")
+    workflow.add_conditional_edges("scout", route_scout)
+    workflow.add_conditional_edges("tools", route_tools)
 
-workflow.set_conditional_entry_point(
-    route_entry,
-    {
-        "extractor": "extractor",
-        "scout": "scout",
-    },
-)
+    return workflow.compile(checkpointer=checkpointer)
 
-workflow.add_edge("extractor", "advisor")
 
+# Session state lives in Redis, keyed by thread_id, so any replica can serve a session
+checkpointer = RedisCheckpointer()
 
-workflow.add_conditional_edges(
-    "advisor",
-    route_advisor,
-    {
-        "tools": "tools",
-        "scout": "scout",
-        END: END,
-    },
+app = build_graph(
+    manage_context,
+    run_extractor,
+    run_advisor,
+    run_scout,
+    handle_tool_call,
+    checkpointer=checkpointer,
 )
-
-workflow.add_conditional_edges("scout", route_scout)
-workflow.add_conditional_edges("tools", route_tools)
-
-app = workflow.compile()
 print("Graph Compiled and Ready to Export.")
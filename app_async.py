@@ -0,0 +1,445 @@
+import json
+import asyncio
+
+from langchain_core.messages import HumanMessage, ToolMessage
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnableConfig
+from langchain_core.tools import StructuredTool
+from pymongo import AsyncMongoClient
+
+from app import (
+    CONTEXT_SUMMARY_TTL,
+    CareerState,
+    EXTRACT_PROMPT,
+    PREFETCH_WAIT_SECONDS,
+    ROLE_MATCH_JACCARD,
+    TOOL_POOL_SIZE,
+    TOOL_TIMEOUTS,
+    advisor_messages,
+    advisor_model,
+    advisor_update,
+    build_graph,
+    canonicalize_skills,
+    checkpointer,
+    context_update,
+    embed_text,
+    extract_parser,
+    find_best_role_match,
+    fold_range,
+    llm_call_keys,
+    extract_model,
+    summary_model,
+    job_prefetcher,
+    prefetch_jobs,
+    recent_messages,
+    record_prompt_tokens,
+    scout_messages,
+    scout_model,
+    search_mongodb_jobs,
+    summary_inputs,
+    summary_prompt,
+    tool_error,
+    tool_state_update,
+)
+from job_search import (
+    MONGO_CONNECTION_STRING,
+    MONGO_DB,
+    MONGO_MAX_TIME_MS,
+    JOB_FIELDS,
+    embedding_model,
+    job_fallback_query,
+    job_query_text,
+    job_search_payload,
+    job_search_pipeline,
+    job_semantic_text,
+    missing_job_search_fields,
+)
+from cache import (
+    LLM_CACHE_SEMANTIC,
+    acache_get,
+    acache_set,
+    allm_cache_get,
+    allm_cache_set,
+    arecord_materialized_lookup,
+    aset_cache_get,
+    aset_cache_set,
+    asemantic_cache_get,
+    asemantic_cache_set,
+    make_key,
+)
+from metrics import TOOL_USAGE, REQUEST_LATENCY, ERROR_COUNT
+from neo4j_client import normalize_skill
+from role_matrix import ROLE_MATCH_ENGINE, get_role_matrix
+from role_match import match_roles, summarize_matches, ROLE_MATCH_TOP_K
+
+
+# Same database as job_search.jobs_collection, through the asyncio driver
+async_mongo_client = AsyncMongoClient(MONGO_CONNECTION_STRING)
+async_jobs_collection = async_mongo_client[MONGO_DB]["job_postings"]
+
+
+async def in_executor(func, *args):
+    """
+    Runs blocking work (embedding model, in-process matrix) off the event loop.
+    """
+    return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+
+async def afind_best_role_match(skills: list[str]) -> str:
+    """
+    find_best_role_match on redis.asyncio and the async Neo4j driver.
+    """
+    TOOL_USAGE.labels(tool_name="find_best_role_match").inc()
+
+    with REQUEST_LATENCY.labels(stage="neo4j_lookup").time():
+        skills = await in_executor(canonicalize_skills, skills)
+        skills_text = ", ".join(sorted([s.strip() for s in skills]))
+        skill_tokens = {normalize_skill(s) for s in skills if s.strip()}
+
+        exact_key = make_key("role_match", {"skills": sorted(skills)})
+
+        # The query vector is needed on every miss, so embed it while Redis answers
+        exact_match, query_vector = await asyncio.gather(
+            acache_get(exact_key),
+            in_executor(embed_text, skills_text),
+            return_exceptions=True,
+        )
+        if exact_match and not isinstance(exact_match, Exception):
+            return json.dumps(exact_match)
+
+        cached_result = await aset_cache_get(
+            skill_tokens, category="role_match", threshold=ROLE_MATCH_JACCARD
+        )
+        if cached_result and "role_name" in cached_result:
+            print(f"[SET HIT] role_match for '{skills_text}'")
+            await acache_set(exact_key, cached_result, ttl=3600)
+            return json.dumps(cached_result)
+
+        if isinstance(query_vector, Exception):
+            return json.dumps({"error": f"Embedding failed: {str(query_vector)}"})
+
+        cached_result = await asemantic_cache_get(
+            query_vector, category="role_match", threshold=0.1
+        )
+        if cached_result and "role_name" in cached_result:
+            print(f"[SEMANTIC HIT] role_match for '{skills_text}'")
+            await acache_set(exact_key, cached_result, ttl=3600)
+            return json.dumps(cached_result)
+
+        print(f"[CACHE MISS] role_match for '{skills_text}'")
+
+        try:
+            if ROLE_MATCH_ENGINE == "matrix":
+                matches = await in_executor(
+                    lambda: get_role_matrix().top_k(skills, k=ROLE_MATCH_TOP_K)
+                )
+            else:
+                # Same per-skill postings cache as the sync tool; only unseen skills hit Neo4j
+                matches = await asyncio.to_thread(match_roles, skills, ROLE_MATCH_TOP_K)
+
+            if not matches:
+                return json.dumps({"error": "No matching role found."})
+
+            result = summarize_matches(matches)
+
+            await asyncio.gather(
+                asemantic_cache_set(skills_text, query_vector, result, category="role_match"),
+                aset_cache_set(skill_tokens, result, category="role_match"),
+                acache_set(exact_key, result, ttl=3600),
+            )
+
+            return json.dumps(result)
+
+        except Exception as e:
+            ERROR_COUNT.labels(type="neo4j").inc()
+            return json.dumps({"error": str(e)})
+
+
+async def aquery_job_postings(
+    job_title: str,
+    location: str,
+    experience_level: str,
+    query_embedding: list[float] | None = None,
+) -> list:
+    """
+    query_job_postings on the async Mongo driver.
+    """
+    with REQUEST_LATENCY.labels(stage="mongo_lookup").time():
+        if query_embedding is None:
+            query_embedding = await in_executor(
+                embedding_model.embed_query,
+                job_query_text(job_title, location, experience_level),
+            )
+
+        pipeline = job_search_pipeline(location, experience_level, query_embedding)
+        cursor = await async_jobs_collection.aggregate(
+            pipeline, maxTimeMS=MONGO_MAX_TIME_MS
+        )
+        results = await cursor.to_list()
+
+        if not results:
+            print("Vector search yielded 0 results. Switching to Regex Fallback...")
+            query = job_fallback_query(job_title, location, experience_level)
+            cursor = async_jobs_collection.find(query, JOB_FIELDS)
+            results = await cursor.max_time_ms(MONGO_MAX_TIME_MS).limit(5).to_list()
+
+    return results
+
+
+async def asearch_mongodb_jobs(
+    job_title: str, location: str = None, experience_level: str = None
+) -> str:
+    """
+    search_mongodb_jobs on redis.asyncio and the async Mongo driver.
+    """
+    TOOL_USAGE.labels(tool_name="search_mongodb_jobs").inc()
+
+    missing_fields = missing_job_search_fields(location, experience_level)
+    if missing_fields:
+        return f"STOP: You cannot search yet. The user has not provided: {', '.join(missing_fields)}. Ask the user for this information."
+
+    payload = job_search_payload(job_title, location, experience_level)
+    exact_key = make_key("job_search", payload)
+    semantic_query = job_semantic_text(job_title, location, experience_level)
+
+    # Exact GET and the embedding for the semantic layer are independent
+    exact_match, query_vector = await asyncio.gather(
+        acache_get(exact_key),
+        in_executor(embedding_model.embed_query, semantic_query),
+    )
+
+    if exact_match is None and await in_executor(
+        job_prefetcher.wait, exact_key, PREFETCH_WAIT_SECONDS
+    ):
+        exact_match = await acache_get(exact_key)
+
+    await arecord_materialized_lookup(exact_key, hit=bool(exact_match))
+    if exact_match:
+        print(f"[EXACT HIT] job_search for {payload}")
+        job_prefetcher.claim(exact_key)
+        return json.dumps(exact_match)
+
+    print(f"[EXACT MISS] job_search for {payload}")
+
+    cached_result = await asemantic_cache_get(
+        query_vector, category="job_search", threshold=0.15
+    )
+    if cached_result:
+        print("[CACHE OPTIMIZATION] Backfilling Exact Cache from Semantic Hit")
+        await acache_set(exact_key, cached_result, ttl=3600)
+        return json.dumps(cached_result)
+
+    print("[CACHE MISS] job_search")
+
+    try:
+        results = await aquery_job_postings(job_title, location, experience_level)
+
+        if not results:
+            return json.dumps({"message": "No jobs found matching your criteria."})
+
+        await asyncio.gather(
+            asemantic_cache_set(semantic_query, query_vector, results, category="job_search"),
+            acache_set(exact_key, results, ttl=3600),
+        )
+
+        return json.dumps(results)
+
+    except Exception as e:
+        print(f"Error in search tool: {e}")
+        return json.dumps({"error": str(e)})
+
+
+def with_coroutine(sync_tool, coroutine) -> StructuredTool:
+    """
+    Same name, description and schema the models were bound with,
+    so tool calls from advisor_model / scout_model resolve to the async version.
+    """
+    return StructuredTool.from_function(
+        func=sync_tool.func,
+        coroutine=coroutine,
+        name=sync_tool.name,
+        description=sync_tool.description,
+        args_schema=sync_tool.args_schema,
+    )
+
+
+ASYNC_TOOLS = {
+    t.name: t
+    for t in [
+        with_coroutine(find_best_role_match, afind_best_role_match),
+        with_coroutine(search_mongodb_jobs, asearch_mongodb_jobs),
+    ]
+}
+
+
+async def aextract_skills_with_semantic_cache(user_input: str):
+    try:
+        query_vector = await in_executor(embed_text, user_input)
+    except Exception as e:
+        print(f"[Extraction Error] Embedding failed: {e}")
+        return []
+
+    cached_result = await asemantic_cache_get(
+        query_vector, category="extraction", threshold=0.15
+    )
+    if cached_result and isinstance(cached_result, dict) and "skills" in cached_result:
+        print(f"[SEMANTIC HIT] Extraction for input: '{user_input[:30]}...'")
+        return cached_result.get("skills", [])
+
+    print(f"[CACHE MISS] Running LLM Extraction for: '{user_input[:30]}...'")
+
+    prompt = ChatPromptTemplate.from_template(EXTRACT_PROMPT)
+    chain = prompt | extract_model | extract_parser
+
+    try:
+        result = await chain.ainvoke({"input": user_input})
+        skills_list = result.get("skills", [])
+
+        await asemantic_cache_set(
+            user_input, query_vector, {"skills": skills_list}, category="extraction"
+        )
+
+        return skills_list
+    except Exception as e:
+        print(f"[Extraction Error] LLM parsing failed: {e}")
+        return []
+
+
+async def ainvoke_cached(agent: str, model, messages: list):
+    """
+    invoke_cached with ainvoke and the async LLM cache.
+    """
+    keys = llm_call_keys(agent, model, messages)
+
+    query_text = query_vector = None
+    if LLM_CACHE_SEMANTIC and isinstance(messages[-1], HumanMessage):
+        query_text = messages[-1].content
+        query_vector = await in_executor(embed_text, query_text)
+
+    if cached := await allm_cache_get(keys, query_vector):
+        return cached
+
+    response = await model.ainvoke(messages)
+    record_prompt_tokens(agent, response)
+    if response.response_metadata.get("fallback"):
+        return response
+    if response.content or response.tool_calls:
+        await allm_cache_set(keys, agent, response, query_text, query_vector)
+    return response
+
+
+async def amanage_context(state: CareerState, config: RunnableConfig):
+    """
+    manage_context with the async cache and summary_model.ainvoke.
+    """
+    prefetch_jobs(state.identified_role, recent_messages(state), config)
+
+    fold = fold_range(state)
+    if fold is None:
+        return {}
+
+    try:
+        key, inputs = summary_inputs(state, *fold)
+        summary = await acache_get(key)
+        if summary is None:
+            with REQUEST_LATENCY.labels(stage="context_summary").time():
+                response = await summary_model.ainvoke(
+                    summary_prompt.format_messages(**inputs)
+                )
+            record_prompt_tokens("summary", response)
+            summary = response.content.strip()
+            if summary:
+                await acache_set(key, summary, ttl=CONTEXT_SUMMARY_TTL)
+    except Exception as e:
+        ERROR_COUNT.labels(type="context_summary").inc()
+        print(f"[Context Error] Summarization failed: {e}")
+        return {}
+
+    return context_update(summary, fold[1])
+
+
+async def arun_extractor(state: CareerState):
+    with REQUEST_LATENCY.labels(stage="extractor_llm").time():
+        print("--- Extractor Node Running (async) ---")
+
+        if not state.messages:
+            return {"current_skills": []}
+
+        extracted_skills = await aextract_skills_with_semantic_cache(
+            state.messages[-1].content
+        )
+
+        if extracted_skills:
+            extracted_skills = await in_executor(canonicalize_skills, extracted_skills)
+            print(f"Skills Extracted: {extracted_skills}")
+            return {"current_skills": extracted_skills}
+
+        return {"current_skills": []}
+
+
+async def arun_advisor(state: CareerState):
+    if state.active_agent == "scout":
+        return {"active_agent": "scout"}
+
+    print("--- Advisor Agent Running (async) ---")
+
+    response = await ainvoke_cached("advisor", advisor_model, advisor_messages(state))
+    return advisor_update(response)
+
+
+async def arun_scout(state: CareerState):
+    print("--- Scout Agent Running (async) ---")
+
+    response = await ainvoke_cached("scout", scout_model, scout_messages(state))
+
+    return {"messages": [response], "active_agent": "scout"}
+
+
+_tool_slots = None
+
+
+async def arun_tool(call: dict, config: RunnableConfig) -> ToolMessage:
+    global _tool_slots
+
+    if call["name"] not in ASYNC_TOOLS:
+        return tool_error(call, f"Unknown tool: {call['name']}")
+    if _tool_slots is None:
+        _tool_slots = asyncio.Semaphore(TOOL_POOL_SIZE)
+
+    timeout = TOOL_TIMEOUTS.get(call["name"], 30.0)
+    try:
+        async with _tool_slots:
+            content = await asyncio.wait_for(
+                ASYNC_TOOLS[call["name"]].ainvoke(call["args"], config), timeout
+            )
+        return ToolMessage(content=content, name=call["name"], tool_call_id=call["id"])
+    except asyncio.TimeoutError:
+        ERROR_COUNT.labels(type="tool_timeout").inc()
+        print(f"[TOOL TIMEOUT] {call['name']} exceeded {timeout}s")
+        return tool_error(call, f"{call['name']} timed out after {timeout}s")
+    except Exception as e:
+        ERROR_COUNT.labels(type="tool").inc()
+        return tool_error(call, str(e))
+
+
+async def ahandle_tool_call(state: CareerState, config: RunnableConfig):
+    # All tool calls of the turn run concurrently; gather keeps call order
+    calls = getattr(state.messages[-1], "tool_calls", None) or []
+    new_messages = await asyncio.gather(*(arun_tool(call, config) for call in calls))
+
+    update = tool_state_update(list(new_messages))
+    if "identified_role" in update:
+        prefetch_jobs(update["identified_role"], recent_messages(state), config)
+    return update
+
+
+# Drive with `await async_app.ainvoke(state)` / `async_app.astream(...)` from one event loop
+async_app = build_graph(
+    amanage_context,
+    arun_extractor,
+    arun_advisor,
+    arun_scout,
+    ahandle_tool_call,
+    checkpointer=checkpointer,
+)
+print("Async Graph Compiled and Ready to Export.")
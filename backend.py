@@ -1,25 +1,31 @@
+import time
+import uuid
 import streamlit as st
 from langchain_core.messages import HumanMessage, AIMessage
 
+from metrics import REQUEST_LATENCY
+
 st.set_page_config(page_title="Kartog AI", page_icon="🗺️", layout="centered")
 
 st.title("🗺️ Kartog AI")
 st.markdown("##### *Mapping your skills to the professional landscape.*")
 st.divider()
 
-if "messages" not in st.session_state:
-    st.session_state.messages = []
-
-if "graph_state" not in st.session_state:
-    st.session_state.graph_state = {"messages": [], "active_agent": "advisor"}
+# The conversation state is checkpointed in Redis under this id; keeping it in
+# the URL lets a reload, or another replica, pick the session back up
+if "thread_id" not in st.session_state:
+    st.session_state.thread_id = st.query_params.get("thread") or uuid.uuid4().hex
+    st.query_params["thread"] = st.session_state.thread_id
 
 with st.sidebar:
     st.header("Kartog Controls")
     st.markdown("Use the controls below to reset your journey.")
 
     if st.button("Start New Map", type="primary"):
+        # The old thread expires in Redis after CHECKPOINT_TTL
+        st.session_state.thread_id = uuid.uuid4().hex
+        st.query_params["thread"] = st.session_state.thread_id
         st.session_state.messages = []
-        st.session_state.graph_state = {"messages": [], "active_agent": "advisor"}
         st.rerun()
     st.divider()
     st.header("Debug Tools")
@@ -95,12 +101,66 @@ def load_graph():
     return app
 
 
+# Only the agents' replies are rendered token by token, not the extractor's JSON
+STREAMED_NODES = {"advisor", "scout"}
+
+
+def describe_update(node: str, update: dict) -> str:
+    """
+    One progress line per finished graph node.
+    """
+    messages = update.get("messages") or []
+    last = messages[-1] if messages else None
+
+    if node == "context":
+        return "Summarized earlier turns" if update.get("summary") else "Context ready"
+    if node == "extractor":
+        skills = update.get("current_skills") or []
+        return f"Skills spotted: {', '.join(skills)}" if skills else "Reading your profile..."
+    if node == "intent":
+        if update.get("intent") in ("confirmation", "logistics"):
+            return "Got it"
+        return "Reading your message..."
+    if node == "fast_path":
+        return "Matching your skills to roles..."
+    if node == "tools":
+        names = ", ".join(f"`{m.name}`" for m in messages)
+        return f"Finished {names}" if names else "Tools finished"
+    if last is not None and getattr(last, "tool_calls", None):
+        names = ", ".join(f"`{call['name']}`" for call in last.tool_calls)
+        return f"{node.capitalize()} is calling {names}..."
+    return f"{node.capitalize()} responded"
+
+
+def transcript(values: dict) -> list[dict]:
+    """
+    Chat bubbles for a checkpointed conversation (user and agent text only).
+    """
+    bubbles = []
+    for message in values.get("messages", []):
+        if isinstance(message, HumanMessage):
+            bubbles.append({"role": "user", "content": message.content})
+        elif isinstance(message, AIMessage) and message.content:
+            bubbles.append({"role": "assistant", "content": message.content})
+    return bubbles
+
+
 try:
     agent_app = load_graph()
 except Exception as e:
     st.error(f"Error loading backend: {e}")
     st.stop()
 
+thread_config = {"configurable": {"thread_id": st.session_state.thread_id}}
+
+if "messages" not in st.session_state:
+    try:
+        st.session_state.messages = transcript(agent_app.get_state(thread_config).values)
+    except Exception as e:
+        # The chat still works; only the earlier turns of this session are not shown
+        st.error(f"Could not restore the conversation: {e}")
+        st.session_state.messages = []
+
 
 for msg in st.session_state.messages:
     with st.chat_message(msg["role"]):
@@ -111,35 +171,74 @@ if user_input := st.chat_input("Describe your skills or career goals..."):
         st.markdown(user_input)
     st.session_state.messages.append({"role": "user", "content": user_input})
 
-    st.session_state.graph_state["messages"].append(HumanMessage(content=user_input))
-
     with st.chat_message("assistant"):
-        with st.status("Charting course...", expanded=True) as status:
-            try:
-                result = agent_app.invoke(st.session_state.graph_state)
-                st.session_state.graph_state = result
+        status = st.status("Charting course...", expanded=True)
+        placeholder = st.empty()
+
+        started = time.perf_counter()
+        first_token_at = None
+        stream_id, streamed_text = None, ""
+        result = None
+
+        try:
+            # Only the new message goes in; the rest is loaded from the checkpoint
+            for mode, chunk in agent_app.stream(
+                {"messages": [HumanMessage(content=user_input)]},
+                thread_config,
+                stream_mode=["updates", "messages", "values"],
+            ):
+                if mode == "messages":
+                    token, metadata = chunk
+                    if metadata.get("langgraph_node") not in STREAMED_NODES:
+                        continue
+                    if not isinstance(token.content, str) or not token.content:
+                        continue
+
+                    if first_token_at is None:
+                        first_token_at = time.perf_counter()
+                        REQUEST_LATENCY.labels(stage="time_to_first_token").observe(
+                            first_token_at - started
+                        )
+                    if token.id != stream_id:  # a new LLM call in the same turn
+                        stream_id, streamed_text = token.id, ""
+                    streamed_text += token.content
+                    placeholder.markdown(
+                        streamed_text.replace("HANDOFF_TO_SCOUT", "") + "▌"
+                    )
+
+                elif mode == "updates":
+                    for node, update in chunk.items():
+                        status.write(describe_update(node, update or {}))
 
-                last_msg = result["messages"][-1]
-
-                if not last_msg.content and getattr(last_msg, "tool_calls", None):
-                    response_text = "*Surveying external job databases...*"
-                    status.write("Scouting terrain...")
                 else:
-                    response_text = last_msg.content
-                    status.write("Drafting response...")
+                    result = chunk
+
+            last_msg = result["messages"][-1]
+
+            if not last_msg.content and getattr(last_msg, "tool_calls", None):
+                response_text = "*Surveying external job databases...*"
+                status.write("Scouting terrain...")
+            else:
+                response_text = last_msg.content
+                status.write("Drafting response...")
+
+            if first_token_at is None:  # answered from cache, nothing was streamed
+                REQUEST_LATENCY.labels(stage="time_to_first_token").observe(
+                    time.perf_counter() - started
+                )
 
-                current_agent = result.get("active_agent", "Kartog").upper()
+            current_agent = result.get("active_agent", "Kartog").upper()
 
-                status.update(label="Route Found", state="complete", expanded=False)
+            status.update(label="Route Found", state="complete", expanded=False)
 
-            except Exception as e:
-                status.update(label="Navigation Error", state="error")
-                st.error(f"System Error: {e}")
-                st.stop()
+        except Exception as e:
+            status.update(label="Navigation Error", state="error")
+            st.error(f"System Error: {e}")
+            st.stop()
 
         formatted_response = f"**{current_agent}**: {response_text}"
-        st.markdown(formatted_response)
+        placeholder.markdown(formatted_response)
 
         st.session_state.messages.append(
             {"role": "assistant", "content": formatted_response}
-        )
\ No newline at end of file
+        )
@@ -0,0 +1,198 @@
+import os
+import csv
+import json
+import time
+import argparse
+from pathlib import Path
+
+from langchain_core.prompts import ChatPromptTemplate
+
+from app import embedding_model, llm_extract, extract_parser
+from batch_match import chunked
+from cache import (
+    check_semantic_cache_get_many,
+    semantic_cache_get_many,
+    semantic_cache_set_many,
+)
+from metrics import REQUEST_LATENCY, ERROR_COUNT
+
+
+BATCH_CHUNK_SIZE = 200
+# Inputs packed into one llm_extract call, bounded by count and by characters
+EXTRACT_BATCH_SIZE = int(os.getenv("EXTRACT_BATCH_SIZE", "8"))
+EXTRACT_BATCH_MAX_CHARS = int(os.getenv("EXTRACT_BATCH_MAX_CHARS", "12000"))
+EXTRACT_BATCH_RETRIES = int(os.getenv("EXTRACT_BATCH_RETRIES", "2"))
+
+BATCH_EXTRACT_PROMPT = """
+You are an expert Resume Parser.
+Extract the technical skills from EACH of the numbered user inputs below, independently.
+Return ONLY a JSON array with exactly one object per input:
+[{{"index": <input number>, "skills": [<strings>]}}, ...]
+Do not include non-technical skills like "hard working" or "team player".
+If an input has no skills, return an empty "skills" list for it.
+
+User Inputs:
+{inputs}
+"""
+
+
+def read_texts(path: str):
+    """
+    Yields {"id", "text"} from a JSONL or CSV file. id defaults to the row number.
+    """
+    suffix = Path(path).suffix.lower()
+
+    with open(path, newline="", encoding="utf-8") as f:
+        if suffix == ".csv":
+            rows = csv.DictReader(f)
+        elif suffix in (".jsonl", ".ndjson"):
+            rows = (json.loads(line) for line in f if line.strip())
+        else:
+            raise ValueError(f"Unsupported input format: {suffix}")
+
+        for number, row in enumerate(rows, start=1):
+            yield {"id": row.get("id") or number, "text": row.get("text") or ""}
+
+
+def pack(texts: dict) -> list[dict]:
+    """
+    Splits {index: text} into prompt-sized groups.
+    """
+    groups, group, size = [], {}, 0
+    for index, text in texts.items():
+        full = len(group) >= EXTRACT_BATCH_SIZE or size + len(text) > EXTRACT_BATCH_MAX_CHARS
+        if group and full:
+            groups.append(group)
+            group, size = {}, 0
+        group[index] = text
+        size += len(text)
+    if group:
+        groups.append(group)
+    return groups
+
+
+def parse_batch_response(response, indexes) -> dict:
+    """
+    Keeps only well-formed entries for the indexes that were asked for.
+    Anything missing or malformed is left out, to be retried.
+    """
+    if isinstance(response, dict):
+        response = response.get("results", [response])
+    if not isinstance(response, list):
+        return {}
+
+    skills = {}
+    for entry in response:
+        if not isinstance(entry, dict):
+            continue
+        index, values = entry.get("index"), entry.get("skills")
+        if isinstance(index, str) and index.isdigit():
+            index = int(index)
+        if index not in indexes or not isinstance(values, list):
+            continue
+        skills[index] = [str(v).strip() for v in values if str(v).strip()]
+    return skills
+
+
+def extract_group(chain, group: dict) -> dict:
+    """
+    One llm_extract call for a group of inputs: {index: skills} for the valid answers.
+    """
+    inputs = "\n".join(f"[{index}] {json.dumps(text)}" for index, text in group.items())
+    try:
+        response = chain.invoke({"inputs": inputs})
+    except Exception as e:
+        ERROR_COUNT.labels(type="llm_batch").inc()
+        print(f"[Extraction Error] Batch of {len(group)} failed: {e}")
+        return {}
+    return parse_batch_response(response, set(group))
+
+
+def extract_skills_batch(texts: list[str]) -> list[list[str] | None]:
+    """
+    Batch extract_skills_with_semantic_cache, on the same semantic cache entries.
+    Every input is embedded in one call and checked in one pipelined pass; the
+    misses are packed several per prompt, and only the inputs whose answer was
+    missing or malformed are retried. None marks inputs that never got a valid answer.
+    """
+    if not texts:
+        return []
+
+    vectors = embedding_model.embed_documents(texts)
+    cached = semantic_cache_get_many(vectors, category="extraction", threshold=0.15)
+
+    results = [None] * len(texts)
+    first_index = {}  # identical inputs are extracted once
+    for i, (text, hit) in enumerate(zip(texts, cached)):
+        if isinstance(hit, dict) and "skills" in hit:
+            results[i] = hit["skills"]
+        else:
+            first_index.setdefault(text, i)
+
+    hits = sum(r is not None for r in results)
+    chain = ChatPromptTemplate.from_template(BATCH_EXTRACT_PROMPT) | llm_extract | extract_parser
+
+    pending = {i: texts[i] for i in first_index.values()}
+    extracted = {}
+    calls = 0
+    for attempt in range(EXTRACT_BATCH_RETRIES + 1):
+        if not pending:
+            break
+        if attempt:
+            print(f"[BATCH RETRY] {len(pending)} inputs, attempt {attempt}")
+        for group in pack(pending):
+            extracted.update(extract_group(chain, group))
+            calls += 1
+        pending = {i: text for i, text in pending.items() if i not in extracted}
+
+    semantic_cache_set_many(
+        [(texts[i], vectors[i], {"skills": skills}) for i, skills in extracted.items()],
+        category="extraction",
+    )
+
+    for i, text in enumerate(texts):
+        if results[i] is None and text in first_index:
+            results[i] = extracted.get(first_index[text])
+
+    print(
+        f"[BATCH] {len(texts)} inputs, {hits} cached, "
+        f"{len(extracted)} extracted in {calls} LLM calls, {len(pending)} failed"
+    )
+    return results
+
+
+def extract_batch(items, chunk_size: int = BATCH_CHUNK_SIZE):
+    """
+    Streams {"id", "skills"} per input text, chunk by chunk.
+    """
+    for chunk in chunked(items, chunk_size):
+        with REQUEST_LATENCY.labels(stage="batch_extraction").time():
+            skills = extract_skills_batch([item["text"] for item in chunk])
+        for item, item_skills in zip(chunk, skills):
+            yield {"id": item["id"], "skills": item_skills}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Extract skills from many CV / profile texts in batched LLM calls."
+    )
+    parser.add_argument("input", help="JSONL/CSV with a 'text' field and optional 'id'")
+    parser.add_argument("--output", help="JSONL output file (default: <input>.skills.jsonl)")
+    parser.add_argument("--chunk-size", type=int, default=BATCH_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    if not check_semantic_cache_get_many():
+        print("[WARN] Semantic cache unavailable; every miss goes to the source")
+    output = args.output or str(Path(args.input).with_suffix(".skills.jsonl"))
+    start = time.perf_counter()
+    count = 0
+    with open(output, "w", encoding="utf-8") as out:
+        for result in extract_batch(read_texts(args.input), args.chunk_size):
+            out.write(json.dumps(result) + "\n")
+            count += 1
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"[OK] Extracted {count} inputs in {elapsed:.1f}s "
+        f"({count / (elapsed or 1):.1f} inputs/s) -> {output}"
+    )
@@ -0,0 +1,156 @@
+import csv
+import json
+import time
+import argparse
+from pathlib import Path
+
+from cache import make_key, cache_get_many, cache_set_many
+from metrics import REQUEST_LATENCY
+from role_matrix import ROLE_MATCH_ENGINE, get_role_matrix
+from role_match import match_roles_batch, summarize_matches, ROLE_MATCH_TOP_K
+
+
+BATCH_CHUNK_SIZE = 500
+ROLE_MATCH_TTL = 3600  # same TTL find_best_role_match uses for its exact keys
+
+
+def parse_skills(value) -> list[str]:
+    if isinstance(value, str):
+        value = value.replace(";", ",").split(",")
+    return [str(s).strip() for s in value or [] if str(s).strip()]
+
+
+def read_skill_lists(path: str):
+    """
+    Yields {"id", "skills"} from a JSONL or CSV file.
+    Skills are a list or a comma/semicolon separated string; id defaults to the row number.
+    """
+    suffix = Path(path).suffix.lower()
+
+    with open(path, newline="", encoding="utf-8") as f:
+        if suffix == ".csv":
+            rows = csv.DictReader(f)
+        elif suffix in (".jsonl", ".ndjson"):
+            rows = (json.loads(line) for line in f if line.strip())
+        else:
+            raise ValueError(f"Unsupported input format: {suffix}")
+
+        for number, row in enumerate(rows, start=1):
+            yield {"id": row.get("id") or number, "skills": parse_skills(row.get("skills"))}
+
+
+def chunked(items, size: int):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def match_chunk(items: list[dict], skill_table=None, k: int = ROLE_MATCH_TOP_K) -> list[dict]:
+    """
+    find_best_role_match for a chunk of skill lists, with the same cache keys.
+    Identical sets are resolved once, cached answers come from one MGET, and
+    the misses go to Neo4j in a single query (or to the in-memory matrix).
+    """
+    names = None
+    if skill_table is not None:
+        names = skill_table.canonical_names([s for item in items for s in item["skills"]])
+
+    # Exact cache key per distinct skill set, exactly as find_best_role_match builds it
+    keys, sets = [], {}
+    for item in items:
+        skills = item["skills"]
+        if skill_table is not None:
+            skills = skill_table.canonicalize(skills, names)
+        key = make_key("role_match", {"skills": sorted(skills)})
+        keys.append(key)
+        sets.setdefault(key, skills)
+
+    distinct = list(sets)
+    results = dict(zip(distinct, cache_get_many(distinct)))
+    misses = {key: sets[key] for key, result in results.items() if result is None}
+
+    if misses:
+        if ROLE_MATCH_ENGINE == "matrix":
+            engine = get_role_matrix()
+            matches = {key: engine.top_k(skills, k=k) for key, skills in misses.items()}
+        else:
+            matches = match_roles_batch(misses, k=k)
+
+        resolved = {key: summarize_matches(m) for key, m in matches.items() if m}
+        cache_set_many(resolved, ttl=ROLE_MATCH_TTL)
+        results.update(resolved)
+
+    print(
+        f"[BATCH] {len(items)} lists, {len(distinct)} distinct sets, "
+        f"{len(distinct) - len(misses)} cached, {len(misses)} resolved"
+    )
+
+    return [
+        {
+            "id": item["id"],
+            "skills": sets[key],
+            "match": results.get(key) or None,
+        }
+        for item, key in zip(items, keys)
+    ]
+
+
+def match_skill_lists(
+    items, chunk_size: int = BATCH_CHUNK_SIZE, skill_table=None, k: int = ROLE_MATCH_TOP_K
+):
+    """
+    Streams one result per input skill list, chunk by chunk.
+    """
+    for chunk in chunked(items, chunk_size):
+        with REQUEST_LATENCY.labels(stage="batch_role_match").time():
+            results = match_chunk(chunk, skill_table, k)
+        yield from results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Match many skill lists (JSONL or CSV) to ontology roles."
+    )
+    parser.add_argument("input", help="JSONL/CSV with a 'skills' field and optional 'id'")
+    parser.add_argument("--output", help="JSONL output file (default: <input>.matches.jsonl)")
+    parser.add_argument("--chunk-size", type=int, default=BATCH_CHUNK_SIZE)
+    parser.add_argument("--top-k", type=int, default=ROLE_MATCH_TOP_K)
+    parser.add_argument(
+        "--no-canonicalize",
+        action="store_true",
+        help="Match skills as given instead of mapping them onto the ontology vocabulary",
+    )
+    args = parser.parse_args()
+
+    skill_table = None
+    if not args.no_canonicalize:
+        from langchain_huggingface import HuggingFaceEmbeddings
+        from skill_vectors import get_skill_table
+
+        skill_table = get_skill_table(
+            HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
+        )
+
+    output = args.output or str(Path(args.input).with_suffix(".matches.jsonl"))
+    start = time.perf_counter()
+    count = 0
+    with open(output, "w", encoding="utf-8") as out:
+        for result in match_skill_lists(
+            read_skill_lists(args.input), args.chunk_size, skill_table, args.top_k
+        ):
+            out.write(json.dumps(result) + "\n")
+            count += 1
+            if count % args.chunk_size == 0:
+                out.flush()
+                print(f"[BATCH] {count} lists, {count / (time.perf_counter() - start):.1f} lists/s")
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"[OK] Matched {count} skill lists in {elapsed:.1f}s "
+        f"({count / (elapsed or 1):.1f} lists/s) -> {output}"
+    )
@@ -0,0 +1,195 @@
+import os
+import csv
+import json
+import time
+import argparse
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from job_search import (
+    embedding_model,
+    missing_job_search_fields,
+    job_search_payload,
+    job_query_text,
+    job_semantic_text,
+    query_job_postings,
+)
+from batch_match import chunked
+from cache import (
+    make_key,
+    cache_get_many,
+    check_semantic_cache_get_many,
+    cache_set_many,
+    semantic_cache_get_many,
+    semantic_cache_set_many,
+)
+from metrics import REQUEST_LATENCY, ERROR_COUNT
+
+
+BATCH_CHUNK_SIZE = 200
+# Concurrent Mongo aggregations; keep below the client's connection pool (100 by default)
+BATCH_SEARCH_WORKERS = int(os.getenv("BATCH_SEARCH_WORKERS", "8"))
+JOB_SEARCH_TTL = 3600  # same TTL search_mongodb_jobs uses for its exact keys
+
+
+def read_queries(path: str):
+    """
+    Yields {"id", "job_title", "location", "experience_level"} from a JSONL or CSV file.
+    id defaults to the row number.
+    """
+    suffix = Path(path).suffix.lower()
+
+    with open(path, newline="", encoding="utf-8") as f:
+        if suffix == ".csv":
+            rows = csv.DictReader(f)
+        elif suffix in (".jsonl", ".ndjson"):
+            rows = (json.loads(line) for line in f if line.strip())
+        else:
+            raise ValueError(f"Unsupported input format: {suffix}")
+
+        for number, row in enumerate(rows, start=1):
+            yield {
+                "id": row.get("id") or number,
+                "job_title": row.get("job_title") or "",
+                "location": row.get("location") or "",
+                "experience_level": row.get("experience_level") or "",
+            }
+
+
+def search_chunk(items: list[dict], workers: int = BATCH_SEARCH_WORKERS) -> list[dict]:
+    """
+    search_mongodb_jobs for a chunk of queries, on the same cache entries.
+    Identical queries run once, exact hits come from one MGET, every text is
+    embedded in one batched model call, semantic lookups share one pipeline,
+    and the remaining aggregations run concurrently on a bounded pool.
+    """
+    results, keys, queries = {}, [], {}
+    for item in items:
+        fields = (item["job_title"], item["location"], item["experience_level"])
+        missing_fields = missing_job_search_fields(item["location"], item["experience_level"])
+        if missing_fields:
+            # Incomplete queries are reported, not searched (the tool would ask the user)
+            key = "missing:" + ",".join(missing_fields)
+            results[key] = {"error": f"Missing {', '.join(missing_fields)}"}
+        else:
+            key = make_key("job_search", job_search_payload(*fields))
+            queries.setdefault(key, fields)
+        keys.append(key)
+
+    distinct = list(queries)
+    for key, value in zip(distinct, cache_get_many(distinct)):
+        if value is not None:
+            results[key] = value
+    misses = [key for key in distinct if key not in results]
+
+    searched = 0
+    if misses:
+        semantic_texts = [job_semantic_text(*queries[k]) for k in misses]
+        vectors = embedding_model.embed_documents(
+            semantic_texts + [job_query_text(*queries[k]) for k in misses]
+        )
+        semantic_vectors, query_vectors = vectors[: len(misses)], vectors[len(misses) :]
+
+        backfill = {}
+        pending = []
+        for key, text, semantic_vector, query_vector, cached in zip(
+            misses,
+            semantic_texts,
+            semantic_vectors,
+            query_vectors,
+            semantic_cache_get_many(semantic_vectors, category="job_search", threshold=0.15),
+        ):
+            if cached:
+                backfill[key] = results[key] = cached
+            else:
+                pending.append((key, text, semantic_vector, query_vector))
+
+        fresh, semantic_entries = {}, []
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(query_job_postings, *queries[key], query_vector): (
+                    key,
+                    text,
+                    semantic_vector,
+                )
+                for key, text, semantic_vector, query_vector in pending
+            }
+            for future in as_completed(futures):
+                key, text, semantic_vector = futures[future]
+                try:
+                    postings = future.result()
+                except Exception as e:
+                    ERROR_COUNT.labels(type="mongo").inc()
+                    results[key] = {"error": str(e)}
+                    continue
+                if not postings:
+                    results[key] = {"message": "No jobs found matching your criteria."}
+                    continue
+                fresh[key] = results[key] = postings
+                semantic_entries.append((text, semantic_vector, postings))
+
+        searched = len(pending)
+        semantic_cache_set_many(semantic_entries, category="job_search")
+        cache_set_many({**backfill, **fresh}, ttl=JOB_SEARCH_TTL)
+
+    print(
+        f"[BATCH] {len(items)} queries, {len(distinct)} distinct, "
+        f"{len(distinct) - len(misses)} exact hits, "
+        f"{len(misses) - searched} semantic hits, {searched} searched"
+    )
+
+    return [
+        {
+            "id": item["id"],
+            "job_title": item["job_title"],
+            "location": item["location"],
+            "experience_level": item["experience_level"],
+            "jobs": results[key],
+        }
+        for item, key in zip(items, keys)
+    ]
+
+
+def search_jobs_batch(
+    items, chunk_size: int = BATCH_CHUNK_SIZE, workers: int = BATCH_SEARCH_WORKERS
+):
+    """
+    Streams one result per (job_title, location, experience_level) query, chunk by chunk.
+    """
+    for chunk in chunked(items, chunk_size):
+        with REQUEST_LATENCY.labels(stage="batch_job_search").time():
+            results = search_chunk(chunk, workers)
+        yield from results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Run search_mongodb_jobs for many (title, location, level) queries."
+    )
+    parser.add_argument(
+        "input", help="JSONL/CSV with job_title, location, experience_level and optional id"
+    )
+    parser.add_argument("--output", help="JSONL output file (default: <input>.jobs.jsonl)")
+    parser.add_argument("--chunk-size", type=int, default=BATCH_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=BATCH_SEARCH_WORKERS)
+    args = parser.parse_args()
+
+    if not check_semantic_cache_get_many():
+        print("[WARN] Semantic cache unavailable; every miss goes to the source")
+    output = args.output or str(Path(args.input).with_suffix(".jobs.jsonl"))
+    start = time.perf_counter()
+    count = 0
+    with open(output, "w", encoding="utf-8") as out:
+        for result in search_jobs_batch(read_queries(args.input), args.chunk_size, args.workers):
+            out.write(json.dumps(result) + "\n")
+            count += 1
+            if count % args.chunk_size == 0:
+                out.flush()
+                rate = count / (time.perf_counter() - start)
+                print(f"[BATCH] {count} queries, {rate:.1f} queries/s")
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"[OK] Searched {count} queries in {elapsed:.1f}s "
+        f"({count / (elapsed or 1):.1f} queries/s) -> {output}"
+    )
@@ -0,0 +1,96 @@
+"""
+Role-match latency with and without the skill-relationship closure.
+
+Runs the in-process matrix engine over the ontology file (no Neo4j needed),
+once plain and once with partial credit through related skills.
+
+    python -m benchmarks.bench_closure --queries 5000 --depth 2
+"""
+
+import json
+import time
+import random
+import argparse
+import statistics
+
+from role_matrix import RoleSkillMatrix
+from skill_closure import compute_closure
+
+
+def load_ontology(path: str):
+    with open(path, encoding="utf-8") as f:
+        entries = json.load(f)
+
+    roles = {
+        entry["role"]: {
+            "description": entry["description"],
+            "requires": entry["must_have_skills"],
+            "recommends": entry["nice_to_have_skills"],
+        }
+        for entry in entries
+    }
+    edges = [
+        (rel["source"], rel["target"])
+        for entry in entries
+        for rel in entry.get("skill_relationships", [])
+    ]
+    return roles, edges
+
+
+def time_queries(engine, queries, use_closure: bool):
+    timings = []
+    for skills in queries:
+        started = time.perf_counter()
+        engine.top_k(skills, k=3, use_closure=use_closure)
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return (
+        statistics.median(timings) * 1e6,
+        timings[int(len(timings) * 0.99) - 1] * 1e6,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ontology", default="data.json")
+    parser.add_argument("--queries", type=int, default=5000)
+    parser.add_argument("--depth", type=int, default=2)
+    parser.add_argument("--decay", type=float, default=0.5)
+    args = parser.parse_args()
+
+    roles, edges = load_ontology(args.ontology)
+
+    started = time.perf_counter()
+    closure = compute_closure(edges, args.decay, args.depth)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    plain = RoleSkillMatrix.from_roles(roles)
+    closed = RoleSkillMatrix.from_roles(roles, closure=closure)
+
+    rng = random.Random(42)
+    vocabulary = sorted({s for edge in edges for s in edge} | set(plain.skill_names))
+    queries = [rng.sample(vocabulary, rng.randint(2, 6)) for _ in range(args.queries)]
+
+    print(
+        f"{len(roles)} roles, {len(plain.skill_names)} role skills, "
+        f"{len(closure[0])} related skills, {closure[1].nnz} closure pairs "
+        f"(built in {build_ms:.1f} ms)\n"
+    )
+    print(f"{'engine':<22} {'p50 us':>9} {'p99 us':>9}")
+    for name, engine, use_closure in (
+        ("matrix", plain, False),
+        (f"matrix + closure d={args.depth}", closed, True),
+    ):
+        p50, p99 = time_queries(engine, queries, use_closure)
+        print(f"{name:<22} {p50:>9.1f} {p99:>9.1f}")
+
+    changed = 0
+    for skills in queries:
+        before = plain.top_k(skills, k=1)
+        after = closed.top_k(skills, k=1)
+        if before and after and before[0]["role_name"] != after[0]["role_name"]:
+            changed += 1
+    print(f"\nTop role changed by partial credit on {changed / len(queries):.1%} of queries")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+Hit rate and false-hit rate of the MinHash/Jaccard cache vs the joined-text embedding cache.
+
+Replays skill-list traffic through both cache strategies in-process. Ground truth
+is the best role computed from the ontology file, so a "false hit" is a cached
+answer naming a different role than a fresh lookup would.
+
+    python -m benchmarks.bench_set_cache --traffic replay.jsonl
+    python -m benchmarks.bench_set_cache --synthetic 2000
+
+Traffic files are JSONL with one {"skills": [...]} object per line.
+"""
+
+import json
+import time
+import random
+import argparse
+from collections import defaultdict
+
+import numpy as np
+
+from minhash import signature, band_hashes, jaccard
+
+
+def normalize_skill(name: str) -> str:
+    # Same rule as neo4j_client.normalize_skill, without pulling in the driver
+    return " ".join(name.split()).lower()
+
+
+def load_postings(path: str) -> dict:
+    postings = defaultdict(set)
+    with open(path, encoding="utf-8") as f:
+        for entry in json.load(f):
+            for skill in entry["must_have_skills"] + entry["nice_to_have_skills"]:
+                postings[normalize_skill(skill)].add(entry["role"])
+    return postings
+
+
+def true_role(postings: dict, skills: list[str]):
+    counts = defaultdict(int)
+    for skill in {normalize_skill(s) for s in skills}:
+        for role in postings.get(skill, ()):
+            counts[role] += 1
+    if not counts:
+        return None
+    return min(counts, key=lambda r: (-counts[r], r))
+
+
+def synthetic_traffic(path: str, size: int, rng: random.Random) -> list[list[str]]:
+    """
+    Popular roles dominate, users list subsets of their skills, in any order
+    and casing, sometimes with an extra unrelated skill.
+    """
+    with open(path, encoding="utf-8") as f:
+        roles = json.load(f)
+    all_skills = sorted({s for r in roles for s in r["must_have_skills"] + r["nice_to_have_skills"]})
+    weights = [1 / (rank + 1) for rank in range(len(roles))]
+
+    traffic = []
+    for _ in range(size):
+        role = rng.choices(roles, weights=weights)[0]
+        pool = role["must_have_skills"] + role["nice_to_have_skills"]
+        skills = rng.sample(pool, rng.randint(2, min(6, len(pool))))
+        if rng.random() < 0.3:
+            skills.append(rng.choice(all_skills))
+        skills = [s.lower() if rng.random() < 0.2 else s for s in skills]
+        rng.shuffle(skills)
+        traffic.append(skills)
+    return traffic
+
+
+class MinHashCache:
+    def __init__(self, threshold: float):
+        self.threshold = threshold
+        self.bands = defaultdict(set)
+        self.entries = {}
+
+    def get(self, skills):
+        tokens = frozenset(normalize_skill(s) for s in skills)
+        candidates = set()
+        for i, digest in enumerate(band_hashes(signature(tokens))):
+            candidates |= self.bands[(i, digest)]
+        best, best_score = None, 0.0
+        for entry_id in candidates:
+            score = jaccard(tokens, entry_id)
+            if score > best_score:
+                best, best_score = self.entries[entry_id], score
+        return best if best_score >= self.threshold else None
+
+    def set(self, skills, response):
+        tokens = frozenset(normalize_skill(s) for s in skills)
+        self.entries[tokens] = response
+        for i, digest in enumerate(band_hashes(signature(tokens))):
+            self.bands[(i, digest)].add(tokens)
+
+
+class EmbeddingCache:
+    """
+    Mirrors find_best_role_match's semantic layer: cosine distance on the
+    embedding of ", ".join(sorted(skills)), FLAT KNN 1, threshold 0.1.
+    """
+
+    def __init__(self, threshold: float):
+        from langchain_huggingface import HuggingFaceEmbeddings
+
+        self.model = HuggingFaceEmbeddings(
+            model_name="sentence-transformers/all-MiniLM-L6-v2"
+        )
+        self.threshold = threshold
+        self.vectors = []
+        self.responses = []
+
+    def _embed(self, skills):
+        vector = np.array(
+            self.model.embed_query(", ".join(sorted(s.strip() for s in skills))),
+            dtype=np.float32,
+        )
+        return vector / np.linalg.norm(vector)
+
+    def get(self, skills):
+        self._last = self._embed(skills)
+        if not self.vectors:
+            return None
+        distances = 1 - np.stack(self.vectors) @ self._last
+        best = int(np.argmin(distances))
+        return self.responses[best] if distances[best] < self.threshold else None
+
+    def set(self, skills, response):
+        self.vectors.append(self._last)
+        self.responses.append(response)
+
+
+def replay(cache, traffic, postings) -> dict:
+    hits = false_hits = 0
+    started = time.perf_counter()
+    for skills in traffic:
+        expected = true_role(postings, skills)
+        cached = cache.get(skills)
+        if cached is not None:
+            hits += 1
+            false_hits += cached != expected
+        else:
+            cache.set(skills, expected)
+    elapsed = time.perf_counter() - started
+    return {
+        "hit_rate": hits / len(traffic),
+        "false_hit_rate": false_hits / hits if hits else 0.0,
+        "lookup_ms": elapsed / len(traffic) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ontology", default="data.json")
+    parser.add_argument("--traffic", help="JSONL file of replayed skill lists")
+    parser.add_argument("--synthetic", type=int, default=2000)
+    parser.add_argument("--jaccard", type=float, default=0.8)
+    parser.add_argument("--cosine", type=float, default=0.1)
+    parser.add_argument("--skip-embedding", action="store_true")
+    args = parser.parse_args()
+
+    postings = load_postings(args.ontology)
+    if args.traffic:
+        with open(args.traffic, encoding="utf-8") as f:
+            traffic = [json.loads(line)["skills"] for line in f if line.strip()]
+    else:
+        traffic = synthetic_traffic(args.ontology, args.synthetic, random.Random(42))
+
+    print(f"Replaying {len(traffic)} skill lists\n")
+    print(f"{'cache':<24} {'hit rate':>9} {'false hits':>11} {'ms/lookup':>10}")
+
+    strategies = [(f"minhash (J>={args.jaccard})", MinHashCache(args.jaccard))]
+    if not args.skip_embedding:
+        strategies.append((f"embedding (d<{args.cosine})", EmbeddingCache(args.cosine)))
+
+    for name, cache in strategies:
+        stats = replay(cache, traffic, postings)
+        print(
+            f"{name:<24} {stats['hit_rate']:>9.1%} {stats['false_hit_rate']:>11.1%} "
+            f"{stats['lookup_ms']:>10.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Role-match query time as the ontology grows: toLower() scan vs Skill.name_norm index seek.
+
+Builds a synthetic ontology under separate labels (BenchRole / BenchSkill) so the
+real graph is never touched, and removes it at the end.
+
+    python -m benchmarks.bench_skill_index --sizes 100 1000 5000 20000
+"""
+
+import time
+import random
+import argparse
+import statistics
+
+from neo4j_client import run_read, run_write, normalize_skill, close_driver
+
+
+SKILLS_PER_ROLE = 8
+QUERY_SKILLS = 5
+
+LEGACY_QUERY = """
+UNWIND $skills AS user_skill
+MATCH (r:BenchRole)-[:REQUIRES|RECOMMENDS]-(s:BenchSkill)
+WHERE toLower(s.name) = toLower(user_skill)
+WITH r, count(s) AS match_count
+ORDER BY match_count DESC LIMIT 1
+RETURN r.name AS role_name, match_count
+"""
+
+INDEXED_QUERY = """
+UNWIND $skill_norms AS skill_norm
+MATCH (s:BenchSkill {name_norm: skill_norm})
+MATCH (r:BenchRole)-[:REQUIRES|RECOMMENDS]->(s)
+WITH r, count(s) AS match_count
+ORDER BY match_count DESC LIMIT 1
+RETURN r.name AS role_name, match_count
+"""
+
+
+def setup_schema():
+    run_write(
+        "CREATE CONSTRAINT bench_skill_name IF NOT EXISTS "
+        "FOR (s:BenchSkill) REQUIRE s.name IS UNIQUE"
+    )
+    run_write(
+        "CREATE INDEX bench_skill_name_norm IF NOT EXISTS "
+        "FOR (s:BenchSkill) ON (s.name_norm)"
+    )
+    run_write("CALL db.awaitIndexes(300)")
+
+
+def grow_ontology(start: int, stop: int, skill_pool: int, rng: random.Random):
+    rows = []
+    for i in range(start, stop):
+        skills = [f"Skill {n}" for n in rng.sample(range(skill_pool), SKILLS_PER_ROLE)]
+        rows.append(
+            {
+                "role": f"Bench Role {i}",
+                "requires": [
+                    {"name": s, "norm": normalize_skill(s)}
+                    for s in skills[: SKILLS_PER_ROLE // 2]
+                ],
+                "recommends": [
+                    {"name": s, "norm": normalize_skill(s)}
+                    for s in skills[SKILLS_PER_ROLE // 2 :]
+                ],
+            }
+        )
+
+    query = """
+    UNWIND $rows AS row
+    MERGE (r:BenchRole {name: row.role})
+    FOREACH (skill IN row.requires |
+        MERGE (s:BenchSkill {name: skill.name})
+        SET s.name_norm = skill.norm
+        MERGE (r)-[:REQUIRES]->(s))
+    FOREACH (skill IN row.recommends |
+        MERGE (s:BenchSkill {name: skill.name})
+        SET s.name_norm = skill.norm
+        MERGE (r)-[:RECOMMENDS]->(s))
+    """
+    for offset in range(0, len(rows), 1000):
+        run_write(query, {"rows": rows[offset : offset + 1000]})
+
+
+def time_query(query: str, parameters_list: list[dict]) -> float:
+    timings = []
+    for parameters in parameters_list:
+        started = time.perf_counter()
+        run_read(query, parameters)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def cleanup():
+    run_write("MATCH (n:BenchRole) DETACH DELETE n")
+    run_write("MATCH (n:BenchSkill) DETACH DELETE n")
+
+
+def main(sizes: list[int], repeats: int):
+    rng = random.Random(42)
+    setup_schema()
+    cleanup()
+
+    print(f"{'roles':>8} {'skills':>8} {'toLower ms':>12} {'name_norm ms':>14} {'speedup':>8}")
+
+    built = 0
+    try:
+        for size in sorted(sizes):
+            skill_pool = max(size * 2, SKILLS_PER_ROLE)
+            grow_ontology(built, size, skill_pool, rng)
+            built = size
+
+            samples = [
+                [f"skill {n}" for n in rng.sample(range(skill_pool), QUERY_SKILLS)]
+                for _ in range(repeats)
+            ]
+            legacy = time_query(LEGACY_QUERY, [{"skills": s} for s in samples])
+            indexed = time_query(
+                INDEXED_QUERY,
+                [{"skill_norms": [normalize_skill(x) for x in s]} for s in samples],
+            )
+
+            skill_count = run_read("MATCH (s:BenchSkill) RETURN count(s) AS c")[0]["c"]
+            print(
+                f"{size:>8} {skill_count:>8} {legacy:>12.2f} {indexed:>14.2f} "
+                f"{legacy / indexed if indexed else 0:>7.1f}x"
+            )
+    finally:
+        cleanup()
+        close_driver()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000, 20000])
+    parser.add_argument("--repeats", type=int, default=50)
+    args = parser.parse_args()
+    main(args.sizes, args.repeats)
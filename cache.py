@@ -2,13 +2,17 @@ import os
 import json
 import hashlib
 import redis
+from redis import asyncio as aioredis
 from prometheus_client import Counter, start_http_server
 import numpy as np
 from redis.commands.search.field import VectorField, TextField, TagField
 from redis.commands.search.index_definition import IndexDefinition, IndexType
 from redis.commands.search.query import Query
 import time
-from metrics import CACHE_OPS, ERROR_COUNT
+import uuid
+from langchain_core.messages import messages_from_dict, messages_to_dict
+from minhash import signature, band_hashes, jaccard
+from metrics import CACHE_OPS, ERROR_COUNT, MATERIALIZED_TRAFFIC
 
 
 REDIS_HOST = os.getenv("REDIS_HOST", "redis")
@@ -17,12 +21,52 @@ REDIS_PORT = int(os.getenv("REDIS_PORT", "6379"))
 CACHE_INDEX_NAME = "semantic_cache_idx"
 VECTOR_DIMENSION = 384  # for 'all-MiniLM-L6-v2'
 
+# Registry of exact keys written by materializer.py
+MATERIALIZED_SET = "materialized:job_search"
+
+# Bumped by insert_data.py whenever the Neo4j ontology is reloaded
+ONTOLOGY_GENERATION_KEY = "ontology:generation"
+
+# Per-skill postings: role_postings:<generation>:<skill_norm> -> {role: 'R' | 'O'}
+POSTINGS_PREFIX = "role_postings"
+POSTINGS_NAME_FIELD = "__name__"  # ontology spelling of the skill, '' if unknown
+POSTINGS_TTL = int(os.getenv("POSTINGS_TTL", "86400"))
+# Role profiles: role_profiles:<generation> -> {role: {"description", "requires", "recommends_count"}}
+ROLE_PROFILES_PREFIX = "role_profiles"
+
+# Extracted skill -> ontology Skill.name, per ontology generation ('' = no match)
+SKILL_ALIAS_PREFIX = "skill_alias"
+SKILL_ALIAS_TTL = int(os.getenv("SKILL_ALIAS_TTL", "604800"))
+
+# MinHash/LSH set-similarity cache: set_cache:<category>:band:<i>:<digest> -> {entry_id}
+SET_CACHE_PREFIX = "set_cache"
+SET_CACHE_MAX_CANDIDATES = 50
+
+# LLM response cache: llm:<agent>:<digest> -> serialized AIMessage
+LLM_CACHE_PREFIX = "llm"
+LLM_CACHE_DEFAULT_TTL = int(os.getenv("LLM_CACHE_TTL", "3600"))
+# Advisor answers depend only on the ontology; scout answers on live job postings
+LLM_CACHE_TTLS = {
+    "advisor": int(os.getenv("LLM_CACHE_TTL_ADVISOR", "86400")),
+    "scout": int(os.getenv("LLM_CACHE_TTL_SCOUT", "1800")),
+}
+# Optional semantic layer on the last user message (off unless LLM_CACHE_SEMANTIC=1)
+LLM_CACHE_SEMANTIC = os.getenv("LLM_CACHE_SEMANTIC", "0") == "1"
+LLM_SEMANTIC_THRESHOLD = float(os.getenv("LLM_SEMANTIC_THRESHOLD", "0.05"))
+
 redis_client = redis.Redis(
     host=REDIS_HOST,
     port=REDIS_PORT,
     decode_responses=True,
 )
 
+# For app_async.py; connections belong to the event loop that first uses them
+async_redis_client = aioredis.Redis(
+    host=REDIS_HOST,
+    port=REDIS_PORT,
+    decode_responses=True,
+)
+
 
 def make_key(prefix: str, payload: dict) -> str:
     """
@@ -38,7 +82,10 @@ def cache_get(key: str):
     Retrieves a value from Redis cache.
     Updates Prometheus HIT / MISS counters.
     """
-    val = redis_client.get(key)
+    return _load_exact(redis_client.get(key))
+
+
+def _load_exact(val):
     method_type = "exact"
 
     if val is not None:
@@ -53,6 +100,126 @@ def cache_set(key: str, value, ttl: int):
     redis_client.setex(key, ttl, json.dumps(value))
 
 
+def cache_exists(key: str) -> bool:
+    """
+    Presence check that leaves the HIT / MISS counters alone (background work).
+    """
+    return bool(redis_client.exists(key))
+
+
+def cache_get_many(keys: list[str]) -> list:
+    """
+    Bulk cache_get: one MGET round trip, None for every miss.
+    """
+    if not keys:
+        return []
+
+    values = []
+    for val in redis_client.mget(keys):
+        if val is None:
+            CACHE_OPS.labels(method="exact", status="miss").inc()
+            values.append(None)
+        else:
+            CACHE_OPS.labels(method="exact", status="hit").inc()
+            values.append(json.loads(val))
+    return values
+
+
+def cache_set_many(items: dict, ttl: int):
+    """
+    Bulk cache_set: {key: value} written in one pipelined round trip.
+    """
+    if not items:
+        return
+
+    pipe = redis_client.pipeline(transaction=False)
+    for key, value in items.items():
+        pipe.setex(key, ttl, json.dumps(value))
+    pipe.execute()
+
+
+def mark_materialized(keys: list[str]):
+    """
+    Registers exact cache keys as precomputed by the materializer.
+    """
+    if keys:
+        redis_client.sadd(MATERIALIZED_SET, *keys)
+
+
+def record_materialized_lookup(key: str, hit: bool):
+    """
+    Counts whether a job_search lookup was served by a materialized entry.
+    """
+    served = hit and bool(redis_client.sismember(MATERIALIZED_SET, key))
+    MATERIALIZED_TRAFFIC.labels(status="materialized" if served else "other").inc()
+
+
+def get_ontology_generation() -> int:
+    return int(redis_client.get(ONTOLOGY_GENERATION_KEY) or 0)
+
+
+def bump_ontology_generation() -> int:
+    """
+    Signals in-process ontology copies (e.g. role_matrix.py) that Neo4j changed.
+    """
+    return redis_client.incr(ONTOLOGY_GENERATION_KEY)
+
+
+def postings_get_many(skill_norms: list[str], generation: int) -> dict:
+    """
+    Fetches the role postings of many skills in one pipelined round trip.
+    Returns {skill_norm: {"name": str, "roles": {role: kind}} or None if never seen}.
+    """
+    pipe = redis_client.pipeline(transaction=False)
+    for skill_norm in skill_norms:
+        pipe.hgetall(f"{POSTINGS_PREFIX}:{generation}:{skill_norm}")
+
+    postings = {}
+    for skill_norm, fields in zip(skill_norms, pipe.execute()):
+        if not fields:
+            CACHE_OPS.labels(method="postings", status="miss").inc()
+            postings[skill_norm] = None
+            continue
+
+        CACHE_OPS.labels(method="postings", status="hit").inc()
+        name = fields.pop(POSTINGS_NAME_FIELD, "")
+        postings[skill_norm] = {"name": name, "roles": fields}
+
+    return postings
+
+
+def postings_set_many(postings: dict, generation: int):
+    """
+    Stores postings (same shape as postings_get_many).
+    Skills unknown to the ontology are stored too, so Neo4j is asked only once.
+    """
+    if not postings:
+        return
+    pipe = redis_client.pipeline(transaction=False)
+    for skill_norm, posting in postings.items():
+        key = f"{POSTINGS_PREFIX}:{generation}:{skill_norm}"
+        pipe.hset(key, mapping={POSTINGS_NAME_FIELD: posting["name"], **posting["roles"]})
+        pipe.expire(key, POSTINGS_TTL)
+    pipe.execute()
+
+
+def role_profiles_get(roles: list[str], generation: int) -> dict:
+    if not roles:
+        return {}
+    values = redis_client.hmget(f"{ROLE_PROFILES_PREFIX}:{generation}", roles)
+    return {role: json.loads(value) for role, value in zip(roles, values) if value is not None}
+
+
+def role_profiles_set_many(profiles: dict, generation: int):
+    if not profiles:
+        return
+    key = f"{ROLE_PROFILES_PREFIX}:{generation}"
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.hset(key, mapping={role: json.dumps(p) for role, p in profiles.items()})
+    pipe.expire(key, POSTINGS_TTL)
+    pipe.execute()
+
+
 def init_semantic_cache():
     """
     Creates a Vector Search Index in Redis if it doesn't exist.
@@ -91,7 +258,23 @@ def semantic_cache_get(
     Performs a K-Nearest Neighbor (KNN) search.
     Threshold 0.1 means 'very similar'. Lower is stricter.
     """
-    query = (
+    params = {"vec": np.array(query_vector, dtype=np.float32).tobytes()}
+
+    try:
+        results = redis_client.ft(CACHE_INDEX_NAME).search(
+            _knn_query(category), query_params=params
+        )
+        return _semantic_result(results, category, threshold)
+
+    except Exception as e:
+        ERROR_COUNT.labels(type="redis_search").inc()
+        print(f"Vector search failed: {e}")
+
+    return None
+
+
+def _knn_query(category: str) -> Query:
+    return (
         Query(f"(@category:{{{category}}})=>[KNN 1 @embedding $vec AS score]")
         .sort_by("score")
         .return_field("$response", "response")
@@ -99,39 +282,39 @@ def semantic_cache_get(
         .dialect(2)
     )
 
-    params = {"vec": np.array(query_vector, dtype=np.float32).tobytes()}
-
-    try:
-        results = redis_client.ft(CACHE_INDEX_NAME).search(query, query_params=params)
-
-        if results.docs:
-            doc = results.docs[0]
-            score = float(doc.score)
 
-            if score < threshold:
-                CACHE_OPS.labels(method="semantic", status="hit").inc()
-                print(f"[SEMANTIC HIT] Category: {category}, Score: {score}")
-                return json.loads(doc.response)
+def _semantic_result(results, category: str, threshold: float):
+    if results.docs:
+        doc = results.docs[0]
+        score = float(doc.score)
 
-            CACHE_OPS.labels(method="semantic", status="miss").inc()
-            print(
-                f"[SEMANTIC MISS] Best match in {category} was score {score} (threshold {threshold})"
-            )
+        if score < threshold:
+            CACHE_OPS.labels(method="semantic", status="hit").inc()
+            print(f"[SEMANTIC HIT] Category: {category}, Score: {score}")
+            return json.loads(doc.response)
 
-    except Exception as e:
-        ERROR_COUNT.labels(type="redis_search").inc()
-        print(f"Vector search failed: {e}")
+        CACHE_OPS.labels(method="semantic", status="miss").inc()
+        print(
+            f"[SEMANTIC MISS] Best match in {category} was score {score} (threshold {threshold})"
+        )
 
     return None
 
 
 def semantic_cache_set(
-    query_text: str, query_vector: list[float], response, category: str
+    query_text: str, query_vector: list[float], response, category: str, ttl: int = 86400
 ):
     """
     Stores the result along with its vector embedding.
     """
 
+    key, data = _semantic_entry(query_text, query_vector, response, category)
+
+    redis_client.json().set(key, "$", data)
+    redis_client.expire(key, ttl)
+
+
+def _semantic_entry(query_text: str, query_vector: list[float], response, category: str):
     key = f"sem_cache:{hash(query_text + category)}"
 
     data = {
@@ -141,9 +324,337 @@ def semantic_cache_set(
         "response": json.dumps(response),
         "created_at": time.time(),
     }
+    return key, data
 
-    redis_client.json().set(key, "$", data)
-    redis_client.expire(key, 86400)  # 24 hours
+
+def _decode(value):
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _search_fields(reply) -> dict:
+    """
+    Fields of the top document of a pipelined FT.SEARCH reply. Pipelines skip
+    the module's reply parser, and FT.SEARCH is never decoded by redis-py, so
+    the raw reply is [total, doc_id, [field, value, ...], ...] in bytes.
+    """
+    if hasattr(reply, "docs"):
+        return vars(reply.docs[0]) if reply.docs else {}
+    if len(reply) > 2:
+        raw = [_decode(item) for item in reply[2]]
+        return dict(zip(raw[::2], raw[1::2]))
+    return {}
+
+
+def check_semantic_cache_get_many() -> bool:
+    """
+    Round trip of a probe entry through semantic_cache_set and the bulk lookup.
+    Batch jobs run it first: if the bulk layer cannot return a stored entry as
+    a hit, every item would silently fall through to the LLM or Mongo.
+    """
+    category = "bulk_check"
+    vector = np.random.default_rng().random(VECTOR_DIMENSION, dtype=np.float32).tolist()
+    probe = {"ok": True}
+    key, _ = _semantic_entry("bulk check", vector, probe, category)
+    try:
+        semantic_cache_set("bulk check", vector, probe, category=category, ttl=60)
+        hit = semantic_cache_get_many([vector], category=category)[0]
+        redis_client.delete(key)
+    except Exception as e:
+        print(f"[SEMANTIC BULK] Check failed: {e}")
+        return False
+
+    if hit != probe:
+        print("[SEMANTIC BULK] Check failed: a stored entry was not returned as a hit")
+        return False
+    return True
+
+
+def semantic_cache_get_many(
+    query_vectors: list[list[float]], category: str, threshold: float = 0.1
+) -> list:
+    """
+    Bulk semantic_cache_get: all KNN searches in one pipelined round trip.
+    Returns the cached response or None per vector.
+    """
+    if not query_vectors:
+        return []
+
+    query = _knn_query(category)
+
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for vector in query_vectors:
+            params = {"vec": np.array(vector, dtype=np.float32).tobytes()}
+            pipe.ft(CACHE_INDEX_NAME).search(query, query_params=params)
+        replies = pipe.execute()
+    except Exception as e:
+        ERROR_COUNT.labels(type="redis_search").inc()
+        print(f"Bulk vector search failed: {e}")
+        return [None] * len(query_vectors)
+
+    responses = []
+    for reply in replies:
+        fields = _search_fields(reply)
+        if "score" in fields and float(fields["score"]) < threshold:
+            CACHE_OPS.labels(method="semantic", status="hit").inc()
+            responses.append(json.loads(fields["response"]))
+        else:
+            CACHE_OPS.labels(method="semantic", status="miss").inc()
+            responses.append(None)
+
+    print(
+        f"[SEMANTIC BULK] Category: {category}, "
+        f"{sum(r is not None for r in responses)}/{len(responses)} hits"
+    )
+    return responses
+
+
+def semantic_cache_set_many(entries: list[tuple], category: str):
+    """
+    Bulk semantic_cache_set: (query_text, query_vector, response) tuples in one pipeline.
+    """
+    if not entries:
+        return
+
+    pipe = redis_client.pipeline(transaction=False)
+    for query_text, query_vector, response in entries:
+        key, data = _semantic_entry(query_text, query_vector, response, category)
+        pipe.json().set(key, "$", data)
+        pipe.expire(key, 86400)
+    pipe.execute()
+
+
+def skill_aliases_get(skill_norms: list[str]) -> dict:
+    """
+    Returns {skill_norm: canonical name or ''} for the aliases already resolved.
+    """
+    if not skill_norms:
+        return {}
+    key = f"{SKILL_ALIAS_PREFIX}:{get_ontology_generation()}"
+    values = redis_client.hmget(key, skill_norms)
+
+    aliases = {}
+    for norm, value in zip(skill_norms, values):
+        CACHE_OPS.labels(method="skill_alias", status="miss" if value is None else "hit").inc()
+        if value is not None:
+            aliases[norm] = value
+    return aliases
+
+
+def skill_aliases_set(aliases: dict):
+    if not aliases:
+        return
+    key = f"{SKILL_ALIAS_PREFIX}:{get_ontology_generation()}"
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.hset(key, mapping=aliases)
+    pipe.expire(key, SKILL_ALIAS_TTL)
+    pipe.execute()
+
+
+def set_cache_get(tokens: set[str], category: str, threshold: float = 0.8):
+    """
+    Finds a cached response whose token set has Jaccard similarity >= threshold.
+    LSH bands select candidates, the stored sets give the exact Jaccard.
+    Two pipelined round trips, no model inference.
+    """
+    if not tokens:
+        return None
+
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for band_key in _band_keys(tokens, category):
+            pipe.smembers(band_key)
+
+        candidates = _set_candidates(pipe.execute(), category)
+        entries = redis_client.mget(candidates) if candidates else []
+
+    except Exception as e:
+        ERROR_COUNT.labels(type="redis_set_cache").inc()
+        print(f"Set-similarity lookup failed: {e}")
+        return None
+
+    return _best_set_entry(tokens, entries, category, threshold)
+
+
+def _band_keys(tokens: set[str], category: str) -> list[str]:
+    return [
+        f"{SET_CACHE_PREFIX}:{category}:band:{i}:{digest}"
+        for i, digest in enumerate(band_hashes(signature(tokens)))
+    ]
+
+
+def _set_candidates(band_members: list, category: str) -> list[str]:
+    """
+    Entry keys listed in the bands, those colliding in the most bands (the
+    likeliest close matches) first, capped at SET_CACHE_MAX_CANDIDATES.
+    """
+    collisions = {}
+    for members in band_members:
+        for c in members:
+            collisions[c] = collisions.get(c, 0) + 1
+    ranked = sorted(collisions, key=lambda c: (-collisions[c], c))
+    return [
+        f"{SET_CACHE_PREFIX}:{category}:entry:{c}"
+        for c in ranked[:SET_CACHE_MAX_CANDIDATES]
+    ]
+
+
+def _best_set_entry(tokens: set[str], entries: list, category: str, threshold: float):
+    best, best_score = None, 0.0
+    for raw in entries:
+        if raw is None:
+            continue  # expired entry still listed in a band
+        entry = json.loads(raw)
+        score = jaccard(tokens, set(entry["tokens"]))
+        if score > best_score:
+            best, best_score = entry, score
+
+    if best is not None and best_score >= threshold:
+        CACHE_OPS.labels(method="minhash", status="hit").inc()
+        print(f"[SET HIT] Category: {category}, Jaccard: {best_score:.2f}")
+        return best["response"]
+
+    CACHE_OPS.labels(method="minhash", status="miss").inc()
+    return None
+
+
+def set_cache_set(tokens: set[str], response, category: str, ttl: int = 86400):
+    """
+    Stores a response under its token set and registers it in every LSH band.
+    """
+    if not tokens:
+        return
+
+    pipe = redis_client.pipeline(transaction=False)
+    _queue_set_entry(pipe, tokens, response, category, ttl)
+    pipe.execute()
+
+
+def _queue_set_entry(pipe, tokens: set[str], response, category: str, ttl: int):
+    entry_id = hashlib.sha256("\x1f".join(sorted(tokens)).encode()).hexdigest()[:16]
+    entry = {"tokens": sorted(tokens), "response": response}
+
+    pipe.setex(f"{SET_CACHE_PREFIX}:{category}:entry:{entry_id}", ttl, json.dumps(entry))
+    for band_key in _band_keys(tokens, category):
+        pipe.sadd(band_key, entry_id)
+        pipe.expire(band_key, ttl)
+
+
+def _canonical_messages(messages) -> list[dict]:
+    """
+    Hashable view of a chat history. Tool call ids are random per call, so they
+    are replaced by their order of appearance; everything else is kept verbatim.
+    """
+    call_ids = {}
+    canonical = []
+    for message in messages:
+        entry = {"type": message.type, "content": message.content}
+        tool_calls = getattr(message, "tool_calls", None)
+        if tool_calls:
+            entry["tool_calls"] = [
+                {
+                    "name": call["name"],
+                    "args": call["args"],
+                    "id": call_ids.setdefault(call["id"], len(call_ids)),
+                }
+                for call in tool_calls
+            ]
+        if message.type == "tool":
+            entry["name"] = message.name
+            entry["tool_call_id"] = call_ids.setdefault(message.tool_call_id, len(call_ids))
+        canonical.append(entry)
+    return canonical
+
+
+def llm_cache_keys(agent: str, messages, tools: list, model_params: dict) -> tuple[str, str]:
+    """
+    (exact key, semantic category) for one model call.
+    The exact key covers system prompt + history + bound tools + model params;
+    the category covers the same minus the last user message, so the semantic
+    layer only matches calls whose history is otherwise identical.
+    """
+    canonical = _canonical_messages(messages)
+    payload = {"agent": agent, "tools": tools, "params": model_params}
+
+    exact_key = make_key(f"{LLM_CACHE_PREFIX}:{agent}", {**payload, "messages": canonical})
+    if canonical and canonical[-1]["type"] == "human":
+        canonical = canonical[:-1]
+    raw = json.dumps({**payload, "messages": canonical}, sort_keys=True)
+    prefix = hashlib.sha256(raw.encode()).hexdigest()[:16]
+    return exact_key, f"llm_{agent}_{prefix}"
+
+
+def _fresh_tool_call_ids(message):
+    """
+    A cached AIMessage gets new tool call ids, so replaying it twice in one
+    conversation never produces duplicate ids.
+    """
+    renamed = {call["id"]: f"call_{uuid.uuid4().hex[:24]}" for call in message.tool_calls}
+    for call in message.tool_calls:
+        call["id"] = renamed[call["id"]]
+    for call in message.additional_kwargs.get("tool_calls", []):
+        call["id"] = renamed.get(call.get("id"), call.get("id"))
+    message.id = None
+    return message
+
+
+def llm_cache_get(keys: tuple[str, str], query_vector: list[float] | None = None):
+    """
+    Returns the cached AIMessage (tool_calls included) or None.
+    The semantic layer is consulted only when a query vector is given.
+    """
+    exact_key, category = keys
+    data = None
+
+    try:
+        val = redis_client.get(exact_key)
+        if val is not None:
+            data = json.loads(val)
+        elif query_vector is not None:
+            data = semantic_cache_get(
+                query_vector, category=category, threshold=LLM_SEMANTIC_THRESHOLD
+            )
+    except Exception as e:
+        ERROR_COUNT.labels(type="redis_llm_cache").inc()
+        print(f"LLM cache lookup failed: {e}")
+
+    return _llm_message(data, category)
+
+
+def _llm_message(data, category: str):
+    if not data:
+        CACHE_OPS.labels(method="llm", status="miss").inc()
+        return None
+
+    CACHE_OPS.labels(method="llm", status="hit").inc()
+    print(f"[LLM HIT] {category}")
+    return _fresh_tool_call_ids(messages_from_dict([data])[0])
+
+
+def llm_cache_set(
+    keys: tuple[str, str],
+    agent: str,
+    message,
+    query_text: str | None = None,
+    query_vector: list[float] | None = None,
+):
+    """
+    Stores an AIMessage under the exact key (and the semantic layer if a
+    query vector is given), with the agent's TTL.
+    """
+    exact_key, category = keys
+    data = json.loads(json.dumps(messages_to_dict([message])[0], default=str))
+    ttl = LLM_CACHE_TTLS.get(agent, LLM_CACHE_DEFAULT_TTL)
+
+    try:
+        redis_client.setex(exact_key, ttl, json.dumps(data))
+        if query_vector is not None:
+            semantic_cache_set(
+                query_text or "", query_vector, data, category=category, ttl=ttl
+            )
+    except Exception as e:
+        ERROR_COUNT.labels(type="redis_llm_cache").inc()
+        print(f"LLM cache write failed: {e}")
 
 
 def invalidate_cache_for_term(term: str):
@@ -173,3 +684,118 @@ def invalidate_cache_for_term(term: str):
 
     except Exception as e:
         print(f"[CACHE CLEANUP ERROR] Could not invalidate: {e}")
+
+
+# asyncio variants of the lookups on the agent's hot path (used by app_async.py)
+
+
+async def acache_get(key: str):
+    return _load_exact(await async_redis_client.get(key))
+
+
+async def acache_set(key: str, value, ttl: int):
+    await async_redis_client.setex(key, ttl, json.dumps(value))
+
+
+async def arecord_materialized_lookup(key: str, hit: bool):
+    served = hit and bool(await async_redis_client.sismember(MATERIALIZED_SET, key))
+    MATERIALIZED_TRAFFIC.labels(status="materialized" if served else "other").inc()
+
+
+async def asemantic_cache_get(
+    query_vector: list[float], category: str, threshold: float = 0.1
+):
+    params = {"vec": np.array(query_vector, dtype=np.float32).tobytes()}
+
+    try:
+        results = await async_redis_client.ft(CACHE_INDEX_NAME).search(
+            _knn_query(category), query_params=params
+        )
+        return _semantic_result(results, category, threshold)
+
+    except Exception as e:
+        ERROR_COUNT.labels(type="redis_search").inc()
+        print(f"Vector search failed: {e}")
+
+    return None
+
+
+async def asemantic_cache_set(
+    query_text: str, query_vector: list[float], response, category: str, ttl: int = 86400
+):
+    key, data = _semantic_entry(query_text, query_vector, response, category)
+
+    async with async_redis_client.pipeline(transaction=False) as pipe:
+        pipe.json().set(key, "$", data)
+        pipe.expire(key, ttl)
+        await pipe.execute()
+
+
+async def aset_cache_get(tokens: set[str], category: str, threshold: float = 0.8):
+    if not tokens:
+        return None
+
+    try:
+        async with async_redis_client.pipeline(transaction=False) as pipe:
+            for band_key in _band_keys(tokens, category):
+                pipe.smembers(band_key)
+            candidates = _set_candidates(await pipe.execute(), category)
+
+        entries = await async_redis_client.mget(candidates) if candidates else []
+
+    except Exception as e:
+        ERROR_COUNT.labels(type="redis_set_cache").inc()
+        print(f"Set-similarity lookup failed: {e}")
+        return None
+
+    return _best_set_entry(tokens, entries, category, threshold)
+
+
+async def aset_cache_set(tokens: set[str], response, category: str, ttl: int = 86400):
+    if not tokens:
+        return
+
+    async with async_redis_client.pipeline(transaction=False) as pipe:
+        _queue_set_entry(pipe, tokens, response, category, ttl)
+        await pipe.execute()
+
+
+async def allm_cache_get(keys: tuple[str, str], query_vector: list[float] | None = None):
+    exact_key, category = keys
+    data = None
+
+    try:
+        val = await async_redis_client.get(exact_key)
+        if val is not None:
+            data = json.loads(val)
+        elif query_vector is not None:
+            data = await asemantic_cache_get(
+                query_vector, category=category, threshold=LLM_SEMANTIC_THRESHOLD
+            )
+    except Exception as e:
+        ERROR_COUNT.labels(type="redis_llm_cache").inc()
+        print(f"LLM cache lookup failed: {e}")
+
+    return _llm_message(data, category)
+
+
+async def allm_cache_set(
+    keys: tuple[str, str],
+    agent: str,
+    message,
+    query_text: str | None = None,
+    query_vector: list[float] | None = None,
+):
+    exact_key, category = keys
+    data = json.loads(json.dumps(messages_to_dict([message])[0], default=str))
+    ttl = LLM_CACHE_TTLS.get(agent, LLM_CACHE_DEFAULT_TTL)
+
+    try:
+        await async_redis_client.setex(exact_key, ttl, json.dumps(data))
+        if query_vector is not None:
+            await asemantic_cache_set(
+                query_text or "", query_vector, data, category=category, ttl=ttl
+            )
+    except Exception as e:
+        ERROR_COUNT.labels(type="redis_llm_cache").inc()
+        print(f"LLM cache write failed: {e}")
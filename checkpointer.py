@@ -0,0 +1,282 @@
+import os
+import zlib
+
+import redis
+from redis import asyncio as aioredis
+from langchain_core.messages import AIMessage, BaseMessage
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from cache import REDIS_HOST, REDIS_PORT
+
+
+CHECKPOINT_PREFIX = "checkpoint"
+# Idle sessions expire after this many seconds; every read or write renews the TTL
+CHECKPOINT_TTL = int(os.getenv("CHECKPOINT_TTL", "604800"))
+# Serialized values from this size up are stored zlib-compressed
+CHECKPOINT_COMPRESS_MIN = int(os.getenv("CHECKPOINT_COMPRESS_MIN", "1024"))
+
+# Checkpoints are msgpack bytes, so these clients do not decode responses
+checkpoint_redis = redis.Redis(host=REDIS_HOST, port=REDIS_PORT)
+async_checkpoint_redis = aioredis.Redis(host=REDIS_HOST, port=REDIS_PORT)
+
+
+def compact_message(message: BaseMessage) -> BaseMessage:
+    """
+    Drops provider metadata the graph never reads back (token usage, model and
+    finish details, the raw copy of tool_calls) from stored AI messages.
+    """
+    if not isinstance(message, AIMessage):
+        return message
+
+    additional_kwargs = {
+        k: v
+        for k, v in message.additional_kwargs.items()
+        if not (k == "tool_calls" and message.tool_calls)
+    }
+    return message.model_copy(
+        update={
+            "response_metadata": {},
+            "usage_metadata": None,
+            "additional_kwargs": additional_kwargs,
+        }
+    )
+
+
+class CompactSerializer(JsonPlusSerializer):
+    """
+    LangGraph's msgpack serializer, with compacted message lists and zlib
+    for large values.
+    """
+
+    def dumps_typed(self, obj) -> tuple[str, bytes]:
+        if isinstance(obj, list) and obj and all(isinstance(m, BaseMessage) for m in obj):
+            obj = [compact_message(m) for m in obj]
+
+        type_, data = super().dumps_typed(obj)
+        if len(data) >= CHECKPOINT_COMPRESS_MIN:
+            return f"{type_}+zlib", zlib.compress(data)
+        return type_, data
+
+    def loads_typed(self, data: tuple[str, bytes]):
+        type_, payload = data
+        if type_.endswith("+zlib"):
+            return super().loads_typed((type_[: -len("+zlib")], zlib.decompress(payload)))
+        return super().loads_typed(data)
+
+
+def _keys(config) -> tuple[str, str, str]:
+    """
+    (thread_id, checkpoint_ns, checkpoint hash key).
+    """
+    thread_id = config["configurable"]["thread_id"]
+    checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+    return thread_id, checkpoint_ns, f"{CHECKPOINT_PREFIX}:{thread_id}:{checkpoint_ns}"
+
+
+def _writes_key(key: str, checkpoint_id: str) -> str:
+    return f"{key}:writes:{checkpoint_id}"
+
+
+def _config(thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> dict:
+    return {
+        "configurable": {
+            "thread_id": thread_id,
+            "checkpoint_ns": checkpoint_ns,
+            "checkpoint_id": checkpoint_id,
+        }
+    }
+
+
+def _pack(typed: tuple[str, bytes]) -> bytes:
+    type_, data = typed
+    return type_.encode() + b"\x00" + data
+
+
+def _unpack(raw: bytes) -> tuple[str, bytes]:
+    type_, _, data = raw.partition(b"\x00")
+    return type_.decode(), data
+
+
+class RedisCheckpointer(BaseCheckpointSaver):
+    """
+    LangGraph checkpointer on the existing Redis, keeping only the latest
+    checkpoint of each thread: one hash with the checkpoint, its metadata and
+    one field per channel (rewritten only when that channel changed), plus a
+    hash of its pending writes. Both expire after CHECKPOINT_TTL of inactivity.
+    """
+
+    def __init__(
+        self,
+        client=checkpoint_redis,
+        async_client=async_checkpoint_redis,
+        ttl: int = CHECKPOINT_TTL,
+    ):
+        super().__init__(serde=CompactSerializer())
+        self.client = client
+        self.async_client = async_client
+        self.ttl = ttl
+
+    def _load(self, config, fields: dict, writes: dict) -> CheckpointTuple | None:
+        if not fields:
+            return None
+
+        thread_id, checkpoint_ns, _ = _keys(config)
+        checkpoint_id = fields[b"id"].decode()
+        requested = get_checkpoint_id(config)
+        if requested and requested != checkpoint_id:
+            return None  # older checkpoints are not kept
+
+        checkpoint = self.serde.loads_typed(_unpack(fields[b"checkpoint"]))
+        values = {}
+        for channel in checkpoint["channel_versions"]:
+            raw = fields.get(f"channel:{channel}".encode())
+            if raw is not None:
+                values[channel] = self.serde.loads_typed(_unpack(raw))
+
+        pending = []
+        for field, raw in writes.items():
+            task_id, idx = field.decode().split("|")
+            channel, task_path, value = self.serde.loads_typed(_unpack(raw))
+            # The order live execution applies a step's writes in
+            pending.append(((task_path, task_id, int(idx)), (task_id, channel, value)))
+
+        parent_id = fields.get(b"parent_id")
+        return CheckpointTuple(
+            config=_config(thread_id, checkpoint_ns, checkpoint_id),
+            checkpoint={**checkpoint, "channel_values": values},
+            metadata=self.serde.loads_typed(_unpack(fields[b"metadata"])),
+            parent_config=(
+                _config(thread_id, checkpoint_ns, parent_id.decode()) if parent_id else None
+            ),
+            pending_writes=[write for _, write in sorted(pending)],
+        )
+
+    def _queue_put(self, pipe, config, checkpoint, metadata, new_versions) -> dict:
+        thread_id, checkpoint_ns, key = _keys(config)
+        stored = checkpoint.copy()
+        values = stored.pop("channel_values")
+
+        mapping = {
+            "id": checkpoint["id"],
+            "checkpoint": _pack(self.serde.dumps_typed(stored)),
+            "metadata": _pack(
+                self.serde.dumps_typed(get_checkpoint_metadata(config, metadata))
+            ),
+        }
+        stale = []
+        if parent_id := config["configurable"].get("checkpoint_id"):
+            mapping["parent_id"] = parent_id
+            pipe.delete(_writes_key(key, parent_id))  # superseded with their checkpoint
+        else:
+            stale.append("parent_id")
+
+        for channel in new_versions:
+            if channel in values:
+                mapping[f"channel:{channel}"] = _pack(self.serde.dumps_typed(values[channel]))
+            else:
+                stale.append(f"channel:{channel}")
+
+        if stale:
+            pipe.hdel(key, *stale)
+        pipe.hset(key, mapping=mapping)
+        pipe.expire(key, self.ttl)
+        return _config(thread_id, checkpoint_ns, checkpoint["id"])
+
+    def _queue_writes(self, pipe, config, writes, task_id: str, task_path: str):
+        _, _, key = _keys(config)
+        writes_key = _writes_key(key, config["configurable"]["checkpoint_id"])
+
+        for idx, (channel, value) in enumerate(writes):
+            idx = WRITES_IDX_MAP.get(channel, idx)
+            field = f"{task_id}|{idx}"
+            raw = _pack(self.serde.dumps_typed([channel, task_path, value]))
+            # Special writes (errors, interrupts) replace earlier ones; regular ones do not
+            if idx < 0:
+                pipe.hset(writes_key, field, raw)
+            else:
+                pipe.hsetnx(writes_key, field, raw)
+        pipe.expire(writes_key, self.ttl)
+
+    def _matches(self, checkpoint_tuple, filter, before) -> bool:
+        before_id = get_checkpoint_id(before) if before else None
+        if before_id and checkpoint_tuple.checkpoint["id"] >= before_id:
+            return False
+        return all(checkpoint_tuple.metadata.get(k) == v for k, v in (filter or {}).items())
+
+    def get_tuple(self, config) -> CheckpointTuple | None:
+        _, _, key = _keys(config)
+        pipe = self.client.pipeline(transaction=False)
+        fields, _ = pipe.hgetall(key).expire(key, self.ttl).execute()
+        if not fields:
+            return None
+
+        writes_key = _writes_key(key, fields[b"id"].decode())
+        pipe = self.client.pipeline(transaction=False)
+        writes, _ = pipe.hgetall(writes_key).expire(writes_key, self.ttl).execute()
+        return self._load(config, fields, writes)
+
+    def list(self, config, *, filter=None, before=None, limit=None):
+        if config is None or limit == 0:
+            return
+        checkpoint_tuple = self.get_tuple(config)
+        if checkpoint_tuple and self._matches(checkpoint_tuple, filter, before):
+            yield checkpoint_tuple
+
+    def put(self, config, checkpoint, metadata, new_versions) -> dict:
+        pipe = self.client.pipeline(transaction=True)
+        next_config = self._queue_put(pipe, config, checkpoint, metadata, new_versions)
+        pipe.execute()
+        return next_config
+
+    def put_writes(self, config, writes, task_id: str, task_path: str = ""):
+        pipe = self.client.pipeline(transaction=False)
+        self._queue_writes(pipe, config, writes, task_id, task_path)
+        pipe.execute()
+
+    def delete_thread(self, thread_id: str):
+        keys = list(self.client.scan_iter(match=f"{CHECKPOINT_PREFIX}:{thread_id}:*"))
+        if keys:
+            self.client.delete(*keys)
+
+    async def aget_tuple(self, config) -> CheckpointTuple | None:
+        _, _, key = _keys(config)
+        pipe = self.async_client.pipeline(transaction=False)
+        fields, _ = await pipe.hgetall(key).expire(key, self.ttl).execute()
+        if not fields:
+            return None
+
+        writes_key = _writes_key(key, fields[b"id"].decode())
+        pipe = self.async_client.pipeline(transaction=False)
+        writes, _ = await pipe.hgetall(writes_key).expire(writes_key, self.ttl).execute()
+        return self._load(config, fields, writes)
+
+    async def alist(self, config, *, filter=None, before=None, limit=None):
+        if config is None or limit == 0:
+            return
+        checkpoint_tuple = await self.aget_tuple(config)
+        if checkpoint_tuple and self._matches(checkpoint_tuple, filter, before):
+            yield checkpoint_tuple
+
+    async def aput(self, config, checkpoint, metadata, new_versions) -> dict:
+        pipe = self.async_client.pipeline(transaction=True)
+        next_config = self._queue_put(pipe, config, checkpoint, metadata, new_versions)
+        await pipe.execute()
+        return next_config
+
+    async def aput_writes(self, config, writes, task_id: str, task_path: str = ""):
+        pipe = self.async_client.pipeline(transaction=False)
+        self._queue_writes(pipe, config, writes, task_id, task_path)
+        await pipe.execute()
+
+    async def adelete_thread(self, thread_id: str):
+        match = f"{CHECKPOINT_PREFIX}:{thread_id}:*"
+        keys = [key async for key in self.async_client.scan_iter(match=match)]
+        if keys:
+            await self.async_client.delete(*keys)
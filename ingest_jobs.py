@@ -0,0 +1,262 @@
+import os
+import json
+import hashlib
+import argparse
+from pathlib import Path
+
+import pandas as pd
+from dotenv import load_dotenv
+from pymongo import MongoClient, UpdateOne
+
+load_dotenv()
+
+MONGO_CONNECTION_STRING = os.getenv("MONGO_CONNECTION_STRING")
+MONGO_DB = os.getenv("MONGO_DB", "jobportal")
+COLLECTION_NAME = "job_postings"
+
+# A posting is identified by what it is, not by its row number in the sheet
+NATURAL_KEY = ["job_title", "company", "location"]
+
+
+def read_chunks(path: str, chunk_size: int):
+    """
+    Yields DataFrames of at most `chunk_size` rows from an Excel, CSV or JSONL file.
+    """
+    suffix = Path(path).suffix.lower()
+
+    if suffix == ".csv":
+        yield from pd.read_csv(path, chunksize=chunk_size)
+
+    elif suffix in (".jsonl", ".ndjson"):
+        yield from pd.read_json(path, lines=True, chunksize=chunk_size)
+
+    elif suffix in (".xlsx", ".xlsm"):
+        # pandas cannot chunk Excel, so stream rows with openpyxl in read-only mode
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                return
+
+            buffer = []
+            for row in rows:
+                buffer.append(row)
+                if len(buffer) >= chunk_size:
+                    yield pd.DataFrame(buffer, columns=header)
+                    buffer = []
+            if buffer:
+                yield pd.DataFrame(buffer, columns=header)
+        finally:
+            workbook.close()
+
+    else:
+        raise ValueError(f"Unsupported input format: {suffix}")
+
+
+def normalize_chunk(df: pd.DataFrame) -> list[dict]:
+    """
+    Column-wise cleanup of one chunk, then conversion to Mongo documents.
+    Mirrors the rules of the original insert_mongo.ipynb loader.
+    """
+    df = df.rename(columns=lambda c: str(c).strip().lower().replace(" ", "_"))
+    df = df.dropna(how="all")
+
+    if "date_posted" in df.columns:
+        df["date_posted"] = pd.to_datetime(
+            df["date_posted"], dayfirst=True, errors="coerce"
+        )
+
+    for column in df.columns:
+        is_text = df[column].map(lambda v: isinstance(v, str))
+        if is_text.any():
+            df[column] = df[column].where(~is_text, df[column].str.strip())
+
+    if "required_skills" in df.columns:
+        skills = df["required_skills"]
+        is_text = skills.map(lambda v: isinstance(v, str))
+        if is_text.any():
+            split = skills.str.split(r"\s*,\s*").map(
+                lambda parts: [p for p in parts if p] if isinstance(parts, list) else parts
+            )
+            df["required_skills"] = split.where(is_text, skills)
+
+    records = df.astype(object).where(df.notna(), None).to_dict("records")
+
+    docs = []
+    for record in records:
+        doc = {k: v for k, v in record.items() if v is not None and v != ""}
+        if "date_posted" in doc:
+            doc["date_posted"] = doc["date_posted"].to_pydatetime()
+        docs.append(doc)
+
+    return docs
+
+
+def natural_key(doc: dict, key_fields: list[str]) -> tuple:
+    return tuple(doc.get(field) for field in key_fields)
+
+
+def content_hash(doc: dict) -> str:
+    raw = json.dumps(doc, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def existing_hashes(collection, docs: list[dict], key_fields: list[str]) -> dict:
+    """
+    Fetches the stored content hash, and whether an embedding is stored, for
+    every document of the chunk in one query.
+    """
+    filters = [{f: doc.get(f) for f in key_fields} for doc in docs]
+    projection = {f: 1 for f in key_fields}
+    projection["content_hash"] = 1
+    # Computed server-side so the vectors themselves are not transferred
+    projection["has_embedding"] = {"$ne": [{"$type": "$embedding"}, "missing"]}
+
+    return {
+        natural_key(doc, key_fields): (doc.get("content_hash"), doc["has_embedding"])
+        for doc in collection.find({"$or": filters}, projection)
+    }
+
+
+def upsert_chunk(collection, docs: list[dict], key_fields: list[str], embed: bool):
+    """
+    Upserts a chunk with one bulk_write, skipping documents whose content is unchanged.
+    With `embed`, unchanged documents stored without an embedding are backfilled;
+    without it, changed documents lose their now stale embedding.
+    Returns (written, unchanged).
+    """
+    for doc in docs:
+        doc["content_hash"] = content_hash(doc)
+
+    stored = existing_hashes(collection, docs, key_fields)
+    changed = []
+    for doc in docs:
+        key = natural_key(doc, key_fields)
+        stored_hash, has_embedding = stored.get(key, (None, False))
+        if stored_hash != doc["content_hash"] or (embed and not has_embedding):
+            changed.append(doc)
+
+    if not changed:
+        return 0, len(docs)
+
+    if embed:
+        from vectorize_db import embedding_model, job_embedding_text
+
+        vectors = embedding_model.embed_documents(
+            [job_embedding_text(doc) for doc in changed]
+        )
+        for doc, vector in zip(changed, vectors):
+            doc["embedding"] = vector
+
+    update = {} if embed else {"$unset": {"embedding": ""}}
+    operations = [
+        UpdateOne(
+            {f: doc.get(f) for f in key_fields},
+            {"$set": doc, **update},
+            upsert=True,
+        )
+        for doc in changed
+    ]
+    collection.bulk_write(operations, ordered=False)
+
+    return len(changed), len(docs) - len(changed)
+
+
+def delete_missing(collection, seen: set, key_fields: list[str], chunk_size: int) -> int:
+    """
+    Deletes only the postings that are no longer present in the input.
+    """
+    projection = {f: 1 for f in key_fields}
+    stale_ids = [
+        doc["_id"]
+        for doc in collection.find({}, projection)
+        if natural_key(doc, key_fields) not in seen
+    ]
+
+    for start in range(0, len(stale_ids), chunk_size):
+        collection.delete_many({"_id": {"$in": stale_ids[start : start + chunk_size]}})
+
+    return len(stale_ids)
+
+
+def ingest(path: str, chunk_size: int, key_fields: list[str], embed: bool, prune: bool):
+    client = MongoClient(MONGO_CONNECTION_STRING)
+    collection = client[MONGO_DB][COLLECTION_NAME]
+
+    try:
+        client.server_info()
+    except Exception as e:
+        print("Cannot connect to MongoDB:", e)
+        return
+
+    seen = set()
+    written = unchanged = skipped = 0
+
+    for chunk_number, df in enumerate(read_chunks(path, chunk_size), start=1):
+        docs = []
+        for doc in normalize_chunk(df):
+            key = natural_key(doc, key_fields)
+            if any(part is None for part in key):
+                skipped += 1
+                continue
+            seen.add(key)
+            docs.append(doc)
+
+        if not docs:
+            continue
+
+        chunk_written, chunk_unchanged = upsert_chunk(
+            collection, docs, key_fields, embed
+        )
+        written += chunk_written
+        unchanged += chunk_unchanged
+        print(
+            f"  Chunk {chunk_number}: {chunk_written} upserted, {chunk_unchanged} unchanged"
+        )
+
+    deleted = 0
+    if prune and seen:
+        deleted = delete_missing(collection, seen, key_fields, chunk_size)
+
+    print(
+        f"Done: {written} upserted, {unchanged} unchanged, {deleted} deleted, "
+        f"{skipped} rows skipped (missing key) in {MONGO_DB}.{COLLECTION_NAME}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Incrementally load job postings from Excel, CSV or JSONL."
+    )
+    parser.add_argument("path", nargs="?", default="job_opportunities.xlsx")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument(
+        "--key",
+        default=",".join(NATURAL_KEY),
+        help="Comma-separated natural key fields used for upserts.",
+    )
+    parser.add_argument(
+        "--embed",
+        action="store_true",
+        help="Compute the `embedding` field for new, changed or unembedded postings.",
+    )
+    parser.add_argument(
+        "--no-prune",
+        action="store_true",
+        help="Keep postings that are missing from the input.",
+    )
+    args = parser.parse_args()
+
+    if not os.path.exists(args.path):
+        print(f"{args.path} not found")
+    else:
+        ingest(
+            args.path,
+            args.chunk_size,
+            [f.strip() for f in args.key.split(",") if f.strip()],
+            args.embed,
+            not args.no_prune,
+        )
@@ -0,0 +1,183 @@
+import os
+import json
+import hashlib
+import argparse
+import threading
+import numpy as np
+
+from cache import redis_client
+
+
+INTENT_EXEMPLARS_PATH = os.getenv("INTENT_EXEMPLARS_PATH", "intent_exemplars.json")
+# Every decision is added to this capped Redis stream for offline accuracy checks,
+# shared by all replicas; empty disables logging
+INTENT_LOG_STREAM = os.getenv("INTENT_LOG_STREAM", "intent:decisions")
+INTENT_LOG_MAXLEN = int(os.getenv("INTENT_LOG_MAXLEN", "10000"))
+# User messages are stored only as a hash unless this is explicitly enabled
+INTENT_LOG_RAW_TEXT = os.getenv("INTENT_LOG_RAW_TEXT", "0") == "1"
+
+# A label only counts when its centroid is this close and this far ahead of the runner-up
+INTENT_MIN_SIMILARITY = float(os.getenv("INTENT_MIN_SIMILARITY", "0.5"))
+INTENT_MIN_MARGIN = float(os.getenv("INTENT_MIN_MARGIN", "0.05"))
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class IntentRouter:
+    """
+    Nearest-centroid classifier over MiniLM embeddings: one mean vector per
+    label of the exemplars file, compared to the message by cosine similarity.
+    """
+
+    def __init__(self, labels: list[str], centroids: np.ndarray):
+        self.labels = list(labels)
+        self.centroids = _normalize(centroids.astype(np.float32))
+
+    @classmethod
+    def from_exemplars(cls, embedding_model, path: str = INTENT_EXEMPLARS_PATH):
+        with open(path, encoding="utf-8") as f:
+            exemplars = json.load(f)
+
+        labels = list(exemplars)
+        texts = [text for label in labels for text in exemplars[label]]
+        vectors = _normalize(
+            np.array(embedding_model.embed_documents(texts), dtype=np.float32)
+        )
+
+        centroids, start = [], 0
+        for label in labels:
+            end = start + len(exemplars[label])
+            centroids.append(vectors[start:end].mean(axis=0))
+            start = end
+        return cls(labels, np.array(centroids))
+
+    def classify(self, vector) -> tuple[str | None, float, float]:
+        """
+        (label, similarity, margin over the runner-up). label is None when the
+        match is too weak or too close to call.
+        """
+        scores = self.centroids @ _normalize(np.asarray(vector, dtype=np.float32))
+        order = np.argsort(scores)[::-1]
+        best = float(scores[order[0]])
+        margin = best - float(scores[order[1]]) if len(order) > 1 else best
+
+        if best < INTENT_MIN_SIMILARITY or margin < INTENT_MIN_MARGIN:
+            return None, best, margin
+        return self.labels[order[0]], best, margin
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.strip().lower().encode()).hexdigest()[:16]
+
+
+def log_decision(text: str, intent: str | None, score: float, margin: float, route: str):
+    print(f"[INTENT] {intent or 'unsure'} ({score:.2f}, +{margin:.2f}) -> {route}")
+    if not INTENT_LOG_STREAM:
+        return
+
+    entry = {
+        "text_hash": text_hash(text),
+        "intent": intent or "",
+        "score": round(score, 4),
+        "margin": round(margin, 4),
+        "route": route,
+    }
+    if INTENT_LOG_RAW_TEXT:
+        entry["text"] = text
+    try:
+        # Approximate trimming keeps XADD O(1); the stream never grows far past the cap
+        redis_client.xadd(
+            INTENT_LOG_STREAM, entry, maxlen=INTENT_LOG_MAXLEN, approximate=True
+        )
+    except Exception as e:
+        print(f"[Intent Log Error] {e}")
+
+
+def export_decisions(path: str) -> int:
+    """
+    Writes the logged decisions to a JSONL file for manual labelling.
+    """
+    rows = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for entry_id, entry in redis_client.xrange(INTENT_LOG_STREAM):
+            entry["ts"] = int(entry_id.split("-")[0]) / 1000
+            entry["intent"] = entry["intent"] or None
+            for field in ("score", "margin"):
+                entry[field] = float(entry[field])
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            rows += 1
+    return rows
+
+
+_router = None
+_router_lock = threading.Lock()
+
+
+def get_intent_router(embedding_model) -> IntentRouter:
+    """
+    Process-wide router; the exemplars are embedded once, on first use.
+    """
+    global _router
+
+    if _router is None:
+        with _router_lock:
+            if _router is None:
+                _router = IntentRouter.from_exemplars(embedding_model)
+                print(f"Intent router loaded: {', '.join(_router.labels)}.")
+    return _router
+
+
+if __name__ == "__main__":
+    from langchain_huggingface import HuggingFaceEmbeddings
+
+    parser = argparse.ArgumentParser(
+        description="Accuracy of the intent router on a labelled JSONL file."
+    )
+    parser.add_argument(
+        "input",
+        nargs="?",
+        help="JSONL with 'text' and 'label' (e.g. reviewed intent_decisions.jsonl)",
+    )
+    parser.add_argument(
+        "--export",
+        metavar="PATH",
+        help="Write the logged decisions to PATH as JSONL and exit.",
+    )
+    args = parser.parse_args()
+
+    if args.export:
+        rows = export_decisions(args.export)
+        print(f"[OK] {rows} decisions written to {args.export}")
+        raise SystemExit
+    if not args.input:
+        parser.error("input is required unless --export is given")
+
+    model = HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
+    router = IntentRouter.from_exemplars(model)
+
+    with open(args.input, encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+
+    vectors = model.embed_documents([row["text"] for row in rows])
+    correct, unsure, confusion = 0, 0, {}
+    for row, vector in zip(rows, vectors):
+        intent, _, _ = router.classify(vector)
+        if intent is None:
+            unsure += 1
+            continue
+        correct += intent == row["label"]
+        pair = (row["label"], intent)
+        confusion[pair] = confusion.get(pair, 0) + 1
+
+    decided = len(rows) - unsure
+    print(
+        f"[OK] {len(rows)} messages, {unsure} left to the extractor, "
+        f"{correct}/{decided} correct ({correct / (decided or 1):.1%})"
+    )
+    for (label, intent), count in sorted(confusion.items()):
+        if label != intent:
+            print(f"  {label} -> {intent}: {count}")
@@ -0,0 +1,155 @@
+import os
+from dotenv import load_dotenv
+from langchain_huggingface import HuggingFaceEmbeddings
+from pymongo import MongoClient
+
+from metrics import REQUEST_LATENCY
+
+# Job search helpers shared by app.py, app_async.py, batch_search.py and the
+# materializer, which imports this module instead of the whole graph
+
+load_dotenv()
+
+MONGO_CONNECTION_STRING = os.getenv("MONGO_CONNECTION_STRING")
+
+MONGO_DB = os.getenv("MONGO_DB", "jobportal")
+
+# Server-side limit for the job search queries, below TOOL_TIMEOUT_JOB_SEARCH:
+# a slow query is aborted instead of holding its tool_pool worker
+MONGO_MAX_TIME_MS = int(os.getenv("MONGO_MAX_TIME_MS", "15000"))
+
+print("Loading Embeddings..")
+
+embedding_model = HuggingFaceEmbeddings(
+    model_name="sentence-transformers/all-MiniLM-L6-v2"
+)
+
+print("Connecting to Databases...")
+
+mongo_client = MongoClient(MONGO_CONNECTION_STRING)
+jobs_collection = mongo_client[MONGO_DB]["job_postings"]
+
+
+def missing_job_search_fields(location: str, experience_level: str) -> list[str]:
+    missing_fields = []
+    if not location or location.lower() in ["unknown", "none", ""]:
+        missing_fields.append("Location")
+
+    if not experience_level or experience_level.lower() in ["unknown", "none", ""]:
+        missing_fields.append("Experience Level")
+
+    return missing_fields
+
+
+def job_search_payload(job_title: str, location: str, experience_level: str) -> dict:
+    """
+    Normalized payload behind the exact `job_search` cache key.
+    Shared with the materializer so precomputed entries land on the same keys.
+    """
+    return {
+        "job_title": job_title.strip().lower(),
+        "location": location.strip().lower(),
+        "experience_level": experience_level.strip().lower(),
+    }
+
+
+def job_semantic_text(job_title: str, location: str, experience_level: str) -> str:
+    return f"{job_title} {location} {experience_level}".strip().lower()
+
+
+def job_query_text(job_title: str, location: str, experience_level: str) -> str:
+    return f"{location} {experience_level} {job_title}"
+
+
+JOB_FIELDS = {
+    "_id": 0,
+    "job_title": 1,
+    "company": 1,
+    "location": 1,
+    "salary_range": 1,
+}
+
+
+def job_search_pipeline(
+    location: str, experience_level: str, query_embedding: list[float]
+) -> list[dict]:
+    """
+    Vector Search aggregation, post-filtered on location and level.
+    """
+    pipeline = [
+        {
+            "$vectorSearch": {
+                "index": "job_vector_index",
+                "path": "embedding",
+                "queryVector": query_embedding,
+                "numCandidates": 100,
+                "limit": 50,
+            }
+        }
+    ]
+
+    match_conditions = []
+    if location:
+        match_conditions.append({"location": {"$regex": location, "$options": "i"}})
+    if experience_level:
+        match_conditions.append(
+            {"experience_level": {"$regex": experience_level, "$options": "i"}}
+        )
+
+    if match_conditions:
+        pipeline.append({"$match": {"$and": match_conditions}})
+
+    pipeline.extend(
+        [
+            {"$addFields": {"score": {"$meta": "vectorSearchScore"}}},
+            {"$project": {**JOB_FIELDS, "score": 1}},
+            {"$limit": 5},
+        ]
+    )
+    return pipeline
+
+
+def job_fallback_query(job_title: str, location: str, experience_level: str) -> dict:
+    """
+    Regex filter used when Vector Search yields nothing.
+    """
+    query = {}
+    if job_title and "anything" not in job_title.lower():
+        query["job_title"] = {"$regex": job_title, "$options": "i"}
+    if location:
+        query["location"] = {"$regex": location, "$options": "i"}
+    if experience_level:
+        query["experience_level"] = {
+            "$regex": experience_level,
+            "$options": "i",
+        }
+    return query
+
+
+def query_job_postings(
+    job_title: str,
+    location: str,
+    experience_level: str,
+    query_embedding: list[float] | None = None,
+) -> list:
+    """
+    Runs the MongoDB lookup behind `search_mongodb_jobs`.
+    Vector Search first, Regex fallback if it yields nothing. No caching here.
+    Batch callers pass the embedding of job_query_text() computed up front.
+    """
+    with REQUEST_LATENCY.labels(stage="mongo_lookup").time():
+        if query_embedding is None:
+            query_embedding = embedding_model.embed_query(
+                job_query_text(job_title, location, experience_level)
+            )
+
+        pipeline = job_search_pipeline(location, experience_level, query_embedding)
+        results = list(jobs_collection.aggregate(pipeline, maxTimeMS=MONGO_MAX_TIME_MS))
+
+        if not results:
+            print("Vector search yielded 0 results. Switching to Regex Fallback...")
+            query = job_fallback_query(job_title, location, experience_level)
+            cursor = jobs_collection.find(query, JOB_FIELDS)
+            results = list(cursor.max_time_ms(MONGO_MAX_TIME_MS).limit(5))
+
+    return results
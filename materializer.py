@@ -0,0 +1,196 @@
+import os
+import time
+import argparse
+import threading
+from dotenv import load_dotenv
+
+from cache import make_key, cache_set, mark_materialized, redis_client, MATERIALIZED_SET
+from metrics import MATERIALIZED_COVERAGE
+from neo4j_client import run_read
+from job_search import jobs_collection, job_search_payload, query_job_postings
+
+load_dotenv()
+
+MATERIALIZED_TTL = int(os.getenv("MATERIALIZED_TTL", "86400"))
+REBUILD_INTERVAL = int(os.getenv("MATERIALIZE_REBUILD_INTERVAL", "21600"))
+# Change events are coalesced per (location, level) and flushed after this many seconds
+CHANGE_FLUSH_SECONDS = float(os.getenv("MATERIALIZE_FLUSH_SECONDS", "5"))
+
+STATS_KEY = "materialized:stats"
+
+
+def load_ontology_roles() -> list[str]:
+    """
+    Role names from the Neo4j ontology (see insert_data.py).
+    """
+    records = run_read("MATCH (r:Role) RETURN r.name AS name ORDER BY name")
+    return [record["name"] for record in records if record["name"]]
+
+
+def load_dimensions() -> tuple[list[str], list[str]]:
+    """
+    Distinct locations and experience levels currently present in job_postings.
+    """
+
+    def clean(values):
+        return sorted({v.strip() for v in values if isinstance(v, str) and v.strip()})
+
+    locations = clean(jobs_collection.distinct("location"))
+    levels = clean(jobs_collection.distinct("experience_level"))
+    return locations, levels
+
+
+def materialize(role: str, location: str, experience_level: str) -> str | None:
+    """
+    Precomputes one search_mongodb_jobs result into the exact cache.
+    Returns the key if something was written, None if the search was empty.
+    """
+    key = make_key("job_search", job_search_payload(role, location, experience_level))
+    results = query_job_postings(role, location, experience_level)
+
+    if not results:
+        # The tool never caches empty results, so neither do we.
+        redis_client.delete(key)
+        redis_client.srem(MATERIALIZED_SET, key)
+        return None
+
+    cache_set(key, results, ttl=MATERIALIZED_TTL)
+    mark_materialized([key])
+    return key
+
+
+def publish_coverage(materialized: int, total: int):
+    coverage = materialized / total if total else 0.0
+    MATERIALIZED_COVERAGE.set(coverage)
+    redis_client.hset(
+        STATS_KEY,
+        mapping={
+            "materialized": materialized,
+            "combinations": total,
+            "coverage": round(coverage, 4),
+            "updated_at": time.time(),
+        },
+    )
+    print(f"[MATERIALIZER] Coverage {materialized}/{total} ({coverage:.1%})")
+
+
+def materialize_all(roles: list[str]) -> set[str]:
+    """
+    Full pass over roles x locations x levels.
+    Drops registry entries that are no longer produced by the current data.
+    """
+    locations, levels = load_dimensions()
+    total = len(roles) * len(locations) * len(levels)
+    print(
+        f"[MATERIALIZER] {len(roles)} roles x {len(locations)} locations x "
+        f"{len(levels)} levels = {total} combinations"
+    )
+
+    written = set()
+    for role in roles:
+        for location in locations:
+            for level in levels:
+                try:
+                    key = materialize(role, location, level)
+                except Exception as e:
+                    print(f"[MATERIALIZER] Failed {role}/{location}/{level}: {e}")
+                    continue
+                if key:
+                    written.add(key)
+
+    stale = set(redis_client.smembers(MATERIALIZED_SET)) - written
+    if stale:
+        redis_client.srem(MATERIALIZED_SET, *stale)
+        redis_client.delete(*stale)
+
+    publish_coverage(len(written), total)
+    return written
+
+
+def refresh_pairs(roles: list[str], pairs: set[tuple[str, str]]):
+    """
+    Incremental refresh: recomputes every role for the touched (location, level) pairs.
+    """
+    for location, level in pairs:
+        print(f"[MATERIALIZER] Refreshing {len(roles)} roles for {location}/{level}")
+        for role in roles:
+            try:
+                materialize(role, location, level)
+            except Exception as e:
+                print(f"[MATERIALIZER] Failed {role}/{location}/{level}: {e}")
+
+    locations, levels = load_dimensions()
+    publish_coverage(
+        redis_client.scard(MATERIALIZED_SET), len(roles) * len(locations) * len(levels)
+    )
+
+
+def watch_changes(roles: list[str]):
+    """
+    Follows the job_postings change stream and refreshes affected combinations.
+    Bursts of events (e.g. a reload) are coalesced before recomputing.
+    """
+    pending = set()
+    last_flush = time.time()
+
+    with jobs_collection.watch(
+        full_document="updateLookup",
+        full_document_before_change="whenAvailable",
+        max_await_time_ms=1000,
+    ) as stream:
+        print("[MATERIALIZER] Listening for job_postings changes...")
+        while stream.alive:
+            change = stream.try_next()
+
+            if change is not None:
+                for doc in (
+                    change.get("fullDocument"),
+                    change.get("fullDocumentBeforeChange"),
+                ):
+                    if not doc:
+                        continue
+                    location = (doc.get("location") or "").strip()
+                    level = (doc.get("experience_level") or "").strip()
+                    if location and level:
+                        pending.add((location, level))
+
+            if pending and (
+                change is None or time.time() - last_flush > CHANGE_FLUSH_SECONDS
+            ):
+                refresh_pairs(roles, pending)
+                pending = set()
+                last_flush = time.time()
+
+
+def rebuild_periodically():
+    while True:
+        time.sleep(REBUILD_INTERVAL)
+        try:
+            materialize_all(load_ontology_roles())
+        except Exception as e:
+            print(f"[MATERIALIZER] Periodic rebuild failed: {e}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Precompute job_search results for ontology roles."
+    )
+    parser.add_argument(
+        "--once", action="store_true", help="Run one full pass and exit."
+    )
+    args = parser.parse_args()
+
+    ontology_roles = load_ontology_roles()
+    materialize_all(ontology_roles)
+
+    if not args.once:
+        threading.Thread(target=rebuild_periodically, daemon=True).start()
+
+        while True:
+            try:
+                watch_changes(ontology_roles)
+            except KeyboardInterrupt:
+                break
+            except Exception as e:
+                print(f"Connection lost, retrying in 5s... Error: {e}")
+                time.sleep(5)
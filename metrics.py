@@ -1,4 +1,4 @@
-from prometheus_client import Counter, Histogram, start_http_server
+from prometheus_client import Counter, Gauge, Histogram, start_http_server
 import socket
 
 
@@ -22,6 +22,62 @@ ERROR_COUNT = Counter(
     "kartog_errors_total", "Exceptions raised in the application", ["type"]
 )
 
+PROMPT_TOKENS = Histogram(
+    "kartog_prompt_tokens",
+    "Prompt tokens sent per LLM call",
+    ["agent"],  # e.g., 'advisor', 'scout', 'summary'
+    buckets=(250, 500, 1000, 2000, 4000, 8000, 16000, 32000),
+)
+
+LLM_CALLS_AVOIDED = Counter(
+    "kartog_llm_calls_avoided_total",
+    "Agent LLM calls skipped because the next step was already known",
+    ["reason"],  # e.g., 'fast_path', 'intent_router'
+)
+
+PREFETCH_OUTCOMES = Counter(
+    "kartog_prefetch_total",
+    "Speculative cache warm-ups by outcome",
+    ["outcome"],  # 'warmed', 'used', 'wasted' or 'dropped' (over budget)
+)
+
+LLM_HEDGES = Counter(
+    "kartog_llm_hedges_total",
+    "Duplicate LLM requests fired after the p95 delay, and how many answered first",
+    ["agent", "status"],  # status: 'fired' or 'won'
+)
+
+LLM_FALLBACKS = Counter(
+    "kartog_llm_fallbacks_total",
+    "Requests to the smaller model when the deadline was at risk",
+    ["agent", "status"],  # status: 'fired' or 'won'
+)
+
+MATERIALIZED_COVERAGE = Gauge(
+    "kartog_materialized_coverage_ratio",
+    "Share of role x location x level combinations currently materialized",
+)
+
+MATERIALIZED_TRAFFIC = Counter(
+    "kartog_materialized_traffic_total",
+    "job_search lookups by whether a materialized entry served them",
+    ["status"],  # status: 'materialized' or 'other'
+)
+
+NEO4J_POOL_IN_USE = Gauge(
+    "kartog_neo4j_pool_in_use", "Neo4j connections currently held by queries"
+)
+
+NEO4J_POOL_UTILIZATION = Gauge(
+    "kartog_neo4j_pool_utilization_ratio",
+    "Neo4j connections in use relative to the configured pool size",
+)
+
+NEO4J_ACQUISITION_WAIT = Histogram(
+    "kartog_neo4j_acquisition_wait_seconds",
+    "Time until a pooled Neo4j connection starts the transaction",
+)
+
 
 def is_port_in_use(port: int) -> bool:
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
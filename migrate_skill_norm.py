@@ -0,0 +1,46 @@
+import argparse
+from neo4j_client import run_read, run_write, normalize_skill, close_driver
+
+
+INDEX_QUERY = "CREATE INDEX skill_name_norm IF NOT EXISTS FOR (s:Skill) ON (s.name_norm)"
+
+
+def migrate(batch_size: int):
+    """
+    Backfills Skill.name_norm on an existing graph and creates its index.
+    Safe to re-run: only skills with a missing or outdated name_norm are written.
+    """
+    print("Creating index on Skill.name_norm...")
+    run_write(INDEX_QUERY)
+    run_write("CALL db.awaitIndexes(300)")
+
+    skills = run_read("MATCH (s:Skill) RETURN s.name AS name, s.name_norm AS name_norm")
+
+    rows = [
+        {"name": skill["name"], "name_norm": normalize_skill(skill["name"])}
+        for skill in skills
+        if skill["name"] and skill["name_norm"] != normalize_skill(skill["name"])
+    ]
+    print(f"{len(skills)} skills found, {len(rows)} need name_norm.")
+
+    update_query = """
+    UNWIND $rows AS row
+    MATCH (s:Skill {name: row.name})
+    SET s.name_norm = row.name_norm
+    """
+    for start in range(0, len(rows), batch_size):
+        run_write(update_query, {"rows": rows[start : start + batch_size]})
+        print(f"  Updated {min(start + batch_size, len(rows))}/{len(rows)}")
+
+    print("[OK] Skill.name_norm migration complete.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill Skill.name_norm.")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    try:
+        migrate(args.batch_size)
+    finally:
+        close_driver()
@@ -0,0 +1,56 @@
+import os
+import hashlib
+import numpy as np
+
+
+NUM_PERM = 128
+# 16 bands x 8 rows: sets above ~0.7 Jaccard collide in at least one band
+LSH_BANDS = int(os.getenv("MINHASH_BANDS", "16"))
+LSH_ROWS = NUM_PERM // LSH_BANDS
+
+# Largest prime below 2**32, so every value mod p fits the uint32 signature
+_PRIME = np.uint64(4294967291)
+_rng = np.random.RandomState(7)
+_A = _rng.randint(1, 2**31, size=NUM_PERM).astype(np.uint64)
+_B = _rng.randint(0, 2**31, size=NUM_PERM).astype(np.uint64)
+
+
+def _token_hashes(tokens: set[str]) -> np.ndarray:
+    return np.array(
+        [
+            int.from_bytes(hashlib.blake2b(t.encode(), digest_size=4).digest(), "little")
+            for t in tokens
+        ],
+        dtype=np.uint64,
+    )
+
+
+def signature(tokens: set[str]) -> np.ndarray:
+    """
+    MinHash signature of a token set: NUM_PERM universal hashes, min per hash.
+    """
+    if not tokens:
+        return np.zeros(NUM_PERM, dtype=np.uint32)
+
+    hashes = _token_hashes(tokens)
+    # (a * h + b) mod p stays below 2**64 because a < 2**31 and h < 2**32
+    permuted = (np.outer(hashes, _A) + _B) % _PRIME
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def band_hashes(sig: np.ndarray) -> list[str]:
+    """
+    One short digest per LSH band; equal digests make two sets candidates.
+    """
+    return [
+        hashlib.blake2b(
+            sig[band * LSH_ROWS : (band + 1) * LSH_ROWS].tobytes(), digest_size=8
+        ).hexdigest()
+        for band in range(LSH_BANDS)
+    ]
+
+
+def jaccard(a: set[str], b: set[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
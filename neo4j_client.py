@@ -0,0 +1,184 @@
+import os
+import time
+import atexit
+import threading
+from dotenv import load_dotenv
+from neo4j import GraphDatabase, AsyncGraphDatabase, unit_of_work
+from metrics import NEO4J_ACQUISITION_WAIT, NEO4J_POOL_IN_USE, NEO4J_POOL_UTILIZATION
+
+load_dotenv()
+
+NEO4J_URI = os.getenv("NEO4J_URI")
+NEO4J_USER = os.getenv("NEO4J_USER")
+NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD")
+AUTH = (NEO4J_USER, NEO4J_PASSWORD)
+
+NEO4J_DATABASE = os.getenv("NEO4J_DATABASE", "neo4j")
+NEO4J_MAX_POOL_SIZE = int(os.getenv("NEO4J_MAX_POOL_SIZE", "50"))
+NEO4J_ACQUISITION_TIMEOUT = float(os.getenv("NEO4J_ACQUISITION_TIMEOUT", "10"))
+# Server-side timeout for queries run on behalf of a tool call: a slow one is aborted
+# instead of holding its tool_pool worker after the caller gave up
+NEO4J_QUERY_TIMEOUT = float(os.getenv("NEO4J_QUERY_TIMEOUT", "10"))
+
+_driver = None
+_driver_lock = threading.Lock()
+_async_driver = None
+
+_in_use = 0
+_in_use_lock = threading.Lock()
+
+
+def get_driver():
+    """
+    Process-wide Neo4j driver, created on first use.
+    The driver owns the connection pool, so every caller shares it.
+    """
+    global _driver
+
+    if _driver is None:
+        with _driver_lock:
+            if _driver is None:
+                print("Connecting to Neo4j (pooled driver)...")
+                _driver = GraphDatabase.driver(
+                    NEO4J_URI,
+                    auth=AUTH,
+                    max_connection_pool_size=NEO4J_MAX_POOL_SIZE,
+                    connection_acquisition_timeout=NEO4J_ACQUISITION_TIMEOUT,
+                )
+    return _driver
+
+
+def close_driver():
+    global _driver
+
+    with _driver_lock:
+        if _driver is not None:
+            _driver.close()
+            _driver = None
+            print("Neo4j driver closed.")
+
+
+atexit.register(close_driver)
+
+
+def get_async_driver():
+    """
+    Process-wide async driver for app_async.py, with the same pool settings.
+    Like any asyncio resource it must be used from a single event loop.
+    """
+    global _async_driver
+
+    if _async_driver is None:
+        with _driver_lock:
+            if _async_driver is None:
+                print("Connecting to Neo4j (pooled async driver)...")
+                _async_driver = AsyncGraphDatabase.driver(
+                    NEO4J_URI,
+                    auth=AUTH,
+                    max_connection_pool_size=NEO4J_MAX_POOL_SIZE,
+                    connection_acquisition_timeout=NEO4J_ACQUISITION_TIMEOUT,
+                )
+    return _async_driver
+
+
+async def close_async_driver():
+    global _async_driver
+
+    if _async_driver is not None:
+        await _async_driver.close()
+        _async_driver = None
+        print("Neo4j async driver closed.")
+
+
+def normalize_skill(name: str) -> str:
+    """
+    Canonical form stored in Skill.name_norm and used for indexed lookups.
+    """
+    return " ".join(name.split()).lower()
+
+
+def _track_in_use(delta: int):
+    global _in_use
+
+    with _in_use_lock:
+        _in_use += delta
+        NEO4J_POOL_IN_USE.set(_in_use)
+        NEO4J_POOL_UTILIZATION.set(_in_use / NEO4J_MAX_POOL_SIZE)
+
+
+def _execute(
+    query: str, parameters: dict | None, write: bool, timeout: float | None = None
+) -> list[dict]:
+    started = time.perf_counter()
+    first_attempt = True
+
+    @unit_of_work(timeout=timeout)
+    def work(tx):
+        nonlocal first_attempt
+        # The transaction function only runs once a pooled connection is held
+        if first_attempt:
+            NEO4J_ACQUISITION_WAIT.observe(time.perf_counter() - started)
+            first_attempt = False
+        result = tx.run(query, parameters or {})
+        return [record.data() for record in result]
+
+    _track_in_use(1)
+    try:
+        with get_driver().session(database=NEO4J_DATABASE) as session:
+            if write:
+                return session.execute_write(work)
+            return session.execute_read(work)
+    finally:
+        _track_in_use(-1)
+
+
+def run_read(
+    query: str, parameters: dict | None = None, timeout: float | None = None
+) -> list[dict]:
+    """
+    Runs a query as a managed read transaction (retried on transient errors).
+    timeout (seconds) aborts it server-side; None keeps the server default.
+    """
+    return _execute(query, parameters, write=False, timeout=timeout)
+
+
+def run_write(query: str, parameters: dict | None = None) -> list[dict]:
+    """
+    Runs a query as a managed write transaction (retried on transient errors).
+    """
+    return _execute(query, parameters, write=True)
+
+
+async def _aexecute(
+    query: str, parameters: dict | None, write: bool, timeout: float | None = None
+) -> list[dict]:
+    started = time.perf_counter()
+    first_attempt = True
+
+    @unit_of_work(timeout=timeout)
+    async def work(tx):
+        nonlocal first_attempt
+        if first_attempt:
+            NEO4J_ACQUISITION_WAIT.observe(time.perf_counter() - started)
+            first_attempt = False
+        result = await tx.run(query, parameters or {})
+        return [record.data() async for record in result]
+
+    _track_in_use(1)
+    try:
+        async with get_async_driver().session(database=NEO4J_DATABASE) as session:
+            if write:
+                return await session.execute_write(work)
+            return await session.execute_read(work)
+    finally:
+        _track_in_use(-1)
+
+
+async def arun_read(
+    query: str, parameters: dict | None = None, timeout: float | None = None
+) -> list[dict]:
+    return await _aexecute(query, parameters, write=False, timeout=timeout)
+
+
+async def arun_write(query: str, parameters: dict | None = None) -> list[dict]:
+    return await _aexecute(query, parameters, write=True)
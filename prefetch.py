@@ -0,0 +1,127 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from metrics import PREFETCH_OUTCOMES
+
+
+PREFETCH_WORKERS = int(os.getenv("PREFETCH_WORKERS", "2"))
+# Prefetch tasks queued or running at once; anything beyond is dropped, never queued
+PREFETCH_BUDGET = int(os.getenv("PREFETCH_BUDGET", "4"))
+# A warmed key not read within this many seconds counts as wasted
+PREFETCH_HORIZON = float(os.getenv("PREFETCH_HORIZON", "1800"))
+# Sessions whose last prefetch target is remembered; the least recently active go first
+PREFETCH_MAX_SCOPES = int(os.getenv("PREFETCH_MAX_SCOPES", "4096"))
+
+
+class Prefetcher:
+    """
+    Speculative cache warming on a small pool, under a budget of outstanding
+    tasks. Tracks every key it wrote so the foreground can report it as used
+    (read before the horizon) or wasted (never read), and wait on a key that
+    is still being warmed instead of repeating the work.
+    """
+
+    def __init__(
+        self,
+        workers: int = PREFETCH_WORKERS,
+        budget: int = PREFETCH_BUDGET,
+        horizon: float = PREFETCH_HORIZON,
+    ):
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prefetch")
+        self.slots = threading.BoundedSemaphore(budget)
+        self.horizon = horizon
+        self.lock = threading.Lock()
+        self.inflight = {}  # key -> threading.Event, set when warming ends
+        self.warmed = {}  # key -> time it was written
+        self.targets = OrderedDict()  # scope -> (last target, time it was set)
+
+    def submit(self, func, *args) -> bool:
+        """
+        Runs func(*args) in the background if the budget allows.
+        """
+        self.sweep()
+        if not self.slots.acquire(blocking=False):
+            PREFETCH_OUTCOMES.labels(outcome="dropped").inc()
+            return False
+
+        def run():
+            try:
+                func(*args)
+            except Exception as e:
+                print(f"[PREFETCH] Task failed: {e}")
+            finally:
+                self.slots.release()
+
+        self.pool.submit(run)
+        return True
+
+    def retarget(self, scope: str, target) -> bool:
+        """
+        Records target as the scope's (e.g. a session's) prefetch target.
+        False if it is the same one already set within the horizon, so the
+        caller can skip repeating that work.
+        """
+        now = time.monotonic()
+        with self.lock:
+            last = self.targets.get(scope)
+            if last is not None and last[0] == target and now - last[1] <= self.horizon:
+                self.targets.move_to_end(scope)
+                return False
+            self.targets[scope] = (target, now)
+            self.targets.move_to_end(scope)
+            while len(self.targets) > PREFETCH_MAX_SCOPES:
+                self.targets.popitem(last=False)
+            return True
+
+    def begin(self, key: str) -> bool:
+        """
+        Claims key for warming. False if it is already warm or being warmed.
+        """
+        with self.lock:
+            if key in self.inflight or key in self.warmed:
+                return False
+            self.inflight[key] = threading.Event()
+            return True
+
+    def finish(self, key: str, written: bool):
+        with self.lock:
+            if written:
+                self.warmed[key] = time.monotonic()
+            event = self.inflight.pop(key, None)
+        if written:
+            PREFETCH_OUTCOMES.labels(outcome="warmed").inc()
+        if event is not None:
+            event.set()
+
+    def wait(self, key: str, timeout: float) -> bool:
+        """
+        Blocks up to timeout on a key still being warmed.
+        True if that warm-up finished and wrote the key.
+        """
+        with self.lock:
+            event = self.inflight.get(key)
+        if event is None or not event.wait(timeout):
+            return False
+        with self.lock:
+            return key in self.warmed
+
+    def claim(self, key: str):
+        """
+        Called on a cache hit: a prefetched key read for the first time counts as used.
+        """
+        with self.lock:
+            written_at = self.warmed.pop(key, None)
+        if written_at is not None:
+            PREFETCH_OUTCOMES.labels(outcome="used").inc()
+
+    def sweep(self):
+        now = time.monotonic()
+        with self.lock:
+            stale = [k for k, at in self.warmed.items() if now - at > self.horizon]
+            for key in stale:
+                del self.warmed[key]
+        if stale:
+            PREFETCH_OUTCOMES.labels(outcome="wasted").inc(len(stale))
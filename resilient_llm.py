@@ -0,0 +1,176 @@
+import os
+import time
+import asyncio
+import threading
+from collections import deque
+
+from langchain_core.runnables import Runnable, ensure_config
+
+from metrics import LLM_HEDGES, LLM_FALLBACKS, ERROR_COUNT, REQUEST_LATENCY
+
+
+# Fire a second identical request once the first has taken longer than the recent p95
+LLM_HEDGING = os.getenv("LLM_HEDGING", "1") == "1"
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+LLM_LATENCY_WINDOW = int(os.getenv("LLM_LATENCY_WINDOW", "200"))
+# Share of the deadline after which the smaller model is asked as well
+LLM_FALLBACK_AT = float(os.getenv("LLM_FALLBACK_AT", "0.6"))
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def llm_loop() -> asyncio.AbstractEventLoop:
+    """
+    Event loop on a daemon thread that runs the attempts of sync callers, so a
+    losing request is cancelled there instead of running on unread.
+    """
+    global _loop
+
+    if _loop is None:
+        with _loop_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="llm", daemon=True)
+                thread.start()
+                _loop = loop
+    return _loop
+
+
+class LLMDeadlineExceeded(TimeoutError):
+    pass
+
+
+class ResilientLLM(Runnable):
+    """
+    Chat model call under a deadline. After the recent p95 latency a hedge (the
+    same request again) is fired; once LLM_FALLBACK_AT of the deadline has passed
+    the fallback model is asked too. The first reply wins and the rest are
+    cancelled. Only the first request streams tokens; the extra ones run silent.
+    """
+
+    def __init__(self, agent: str, primary, fallback=None, deadline: float = 30.0):
+        self.agent = agent
+        self.primary = primary
+        self.fallback = fallback
+        self.deadline = deadline
+        self._latencies = deque(maxlen=LLM_LATENCY_WINDOW)
+        self._lock = threading.Lock()
+
+    def hedge_delay(self) -> float | None:
+        """
+        Recent p95 of the primary model, or None while there is too little
+        history (or when the fallback would fire first anyway).
+        """
+        with self._lock:
+            samples = sorted(self._latencies)
+        if not LLM_HEDGING or len(samples) < LLM_HEDGE_MIN_SAMPLES:
+            return None
+
+        p95 = samples[int(0.95 * (len(samples) - 1))]
+        if self.fallback is not None and p95 >= self.deadline * LLM_FALLBACK_AT:
+            return None
+        return p95
+
+    def _plan(self) -> list[tuple[float, str]]:
+        """
+        (seconds after the start, attempt) for the extra requests, in order.
+        """
+        plan = []
+        if (delay := self.hedge_delay()) is not None:
+            plan.append((delay, "hedge"))
+        if self.fallback is not None:
+            plan.append((self.deadline * LLM_FALLBACK_AT, "fallback"))
+        return sorted(plan)
+
+    def _record(self, start: float, task: asyncio.Task):
+        """
+        Latency sample of every primary request, won or lost. One cancelled
+        (a hedge or the fallback won, or the deadline passed) counts with the
+        time it had run, a lower bound capped at the deadline.
+        """
+        if not task.cancelled() and task.exception() is not None:
+            return
+        with self._lock:
+            self._latencies.append(min(time.monotonic() - start, self.deadline))
+
+    def _fire(self, kind: str):
+        print(f"[LLM] {self.agent}: firing {kind}")
+        counter = LLM_FALLBACKS if kind == "fallback" else LLM_HEDGES
+        counter.labels(agent=self.agent, status="fired").inc()
+
+    def _won(self, kind: str, response, elapsed: float):
+        if kind == "fallback":
+            LLM_FALLBACKS.labels(agent=self.agent, status="won").inc()
+            # Marked so the LLM cache does not store it under the primary's key
+            response.response_metadata["fallback"] = True
+        elif kind == "hedge":
+            LLM_HEDGES.labels(agent=self.agent, status="won").inc()
+
+        REQUEST_LATENCY.labels(stage=f"llm_{self.agent}").observe(elapsed)
+        return response
+
+    def _expired(self):
+        ERROR_COUNT.labels(type="llm_deadline").inc()
+        return LLMDeadlineExceeded(
+            f"{self.agent} LLM call exceeded its {self.deadline}s deadline"
+        )
+
+    def _model(self, kind: str):
+        return self.fallback if kind == "fallback" else self.primary
+
+    @staticmethod
+    def _silent(config) -> dict:
+        return {**(config or {}), "callbacks": []}
+
+    def invoke(self, input, config=None, **kwargs):
+        # Resolved here, where the node's callbacks are in context, so the
+        # primary still streams its tokens from the loop thread
+        config = ensure_config(config)
+        coroutine = self.ainvoke(input, config)
+        return asyncio.run_coroutine_threadsafe(coroutine, llm_loop()).result()
+
+    async def ainvoke(self, input, config=None, **kwargs):
+        start = time.monotonic()
+        plan = self._plan()
+        error = None
+
+        primary = asyncio.create_task(self.primary.ainvoke(input, config))
+        primary.add_done_callback(lambda task: self._record(start, task))
+        attempts = {primary: "primary"}
+
+        try:
+            while True:
+                elapsed = time.monotonic() - start
+                while plan and (plan[0][0] <= elapsed or not attempts):
+                    _, kind = plan.pop(0)
+                    self._fire(kind)
+                    task = asyncio.create_task(
+                        self._model(kind).ainvoke(input, self._silent(config))
+                    )
+                    attempts[task] = kind
+                if not attempts:
+                    raise error
+
+                next_at = min(plan[0][0], self.deadline) if plan else self.deadline
+                done, _ = await asyncio.wait(
+                    attempts,
+                    timeout=max(0.0, next_at - elapsed),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+
+                for task in done:
+                    kind = attempts.pop(task)
+                    if task.exception() is not None:
+                        print(f"[LLM] {self.agent}: {kind} failed: {task.exception()}")
+                        error = task.exception()
+                        continue
+                    elapsed = time.monotonic() - start
+                    return self._won(kind, task.result(), elapsed)
+
+                if time.monotonic() - start >= self.deadline:
+                    raise self._expired()
+        finally:
+            # Losers stop here, including the primary's token stream
+            for task in attempts:
+                task.cancel()
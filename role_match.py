@@ -0,0 +1,221 @@
+import os
+from collections import defaultdict
+
+from cache import (
+    get_ontology_generation,
+    postings_get_many,
+    postings_set_many,
+    role_profiles_get,
+    role_profiles_set_many,
+)
+from neo4j_client import NEO4J_QUERY_TIMEOUT, run_read, normalize_skill
+from role_matrix import REQUIRES_WEIGHT, RECOMMENDS_WEIGHT, coverage
+
+
+REQUIRED, OPTIONAL = "R", "O"
+
+# How many roles find_best_role_match returns (best + alternatives)
+ROLE_MATCH_TOP_K = int(os.getenv("ROLE_MATCH_TOP_K", "3"))
+
+POSTINGS_QUERY = """
+UNWIND $skill_norms AS skill_norm
+MATCH (s:Skill {name_norm: skill_norm})
+OPTIONAL MATCH (r:Role)-[rel:REQUIRES|RECOMMENDS]->(s)
+RETURN skill_norm, s.name AS skill, r.name AS role, type(rel) AS rel_type
+"""
+
+PROFILES_QUERY = """
+MATCH (r:Role) WHERE r.name IN $roles
+OPTIONAL MATCH (r)-[rel:REQUIRES|RECOMMENDS]->(s:Skill)
+RETURN r.name AS role, r.description AS description,
+       collect(CASE WHEN type(rel) = 'REQUIRES' THEN s.name END) AS requires,
+       count(CASE WHEN type(rel) = 'RECOMMENDS' THEN 1 END) AS recommends_count
+"""
+
+# Top-k roles for many skill sets in one round trip (batch_match.py).
+# A skill a role both requires and recommends counts as required, like match_roles.
+BATCH_MATCH_QUERY = """
+UNWIND $batches AS batch
+CALL {
+    WITH batch
+    UNWIND batch.skill_norms AS skill_norm
+    MATCH (r:Role)-[rel:REQUIRES|RECOMMENDS]->(s:Skill {name_norm: skill_norm})
+    WITH r, collect(DISTINCT s.name) AS matched_skills,
+         collect(DISTINCT CASE WHEN type(rel) = 'REQUIRES' THEN s.name END) AS required_skills
+    WITH r, matched_skills,
+         size(required_skills) AS required_hits,
+         size(matched_skills) - size(required_skills) AS optional_hits
+    ORDER BY $requires_weight * required_hits + $recommends_weight * optional_hits DESC,
+             size(matched_skills) DESC, r.name
+    LIMIT $k
+    RETURN collect({
+        role_name: r.name,
+        description: r.description,
+        matched_skills: matched_skills,
+        required_hits: required_hits,
+        optional_hits: optional_hits,
+        requires: [(r)-[:REQUIRES]->(req:Skill) | req.name],
+        recommends_count: size([(r)-[:RECOMMENDS]->(:Skill) | 1])
+    }) AS matches
+}
+RETURN batch.id AS id, matches
+"""
+
+
+def fetch_postings(skill_norms: list[str]) -> dict:
+    """
+    Reads skill -> roles postings for never-seen skills from Neo4j.
+    """
+    postings = {norm: {"name": "", "roles": {}} for norm in skill_norms}
+
+    records = run_read(
+        POSTINGS_QUERY, {"skill_norms": skill_norms}, timeout=NEO4J_QUERY_TIMEOUT
+    )
+    for record in records:
+        posting = postings[record["skill_norm"]]
+        posting["name"] = record["skill"]
+        if record["role"] is None:
+            continue
+        kind = REQUIRED if record["rel_type"] == "REQUIRES" else OPTIONAL
+        # A role both requiring and recommending a skill counts as required
+        if posting["roles"].get(record["role"]) != REQUIRED:
+            posting["roles"][record["role"]] = kind
+
+    return postings
+
+
+def fetch_profiles(roles: list[str]) -> dict:
+    """
+    Description, full REQUIRES list and RECOMMENDS count per role, from Neo4j.
+    """
+    return {
+        record["role"]: {
+            "description": record["description"] or "",
+            "requires": record["requires"],
+            "recommends_count": record["recommends_count"],
+        }
+        for record in run_read(
+            PROFILES_QUERY, {"roles": roles}, timeout=NEO4J_QUERY_TIMEOUT
+        )
+    }
+
+
+def match_roles(skills: list[str], k: int = ROLE_MATCH_TOP_K) -> list[dict]:
+    """
+    Top-k roles composed from per-skill postings, each with mandatory/optional
+    coverage and the REQUIRES skills the user is missing.
+    Only skills and roles never seen before (in this ontology generation) go to Neo4j.
+    """
+    skill_norms = sorted({normalize_skill(s) for s in skills if s.strip()})
+    if not skill_norms:
+        return []
+
+    generation = get_ontology_generation()
+    postings = postings_get_many(skill_norms, generation)
+
+    unseen = [norm for norm, posting in postings.items() if posting is None]
+    if unseen:
+        print(f"[POSTINGS MISS] Fetching {len(unseen)} skills from Neo4j: {unseen}")
+        fetched = fetch_postings(unseen)
+        postings_set_many(fetched, generation)
+        postings.update(fetched)
+
+    required_hits = defaultdict(int)
+    optional_hits = defaultdict(int)
+    matched_skills = defaultdict(list)
+
+    for posting in postings.values():
+        for role, kind in posting["roles"].items():
+            if kind == REQUIRED:
+                required_hits[role] += 1
+            else:
+                optional_hits[role] += 1
+            matched_skills[role].append(posting["name"])
+
+    def rank(role):
+        weighted = (
+            REQUIRES_WEIGHT * required_hits[role] + RECOMMENDS_WEIGHT * optional_hits[role]
+        )
+        return (-weighted, -len(matched_skills[role]), role)
+
+    ranked = sorted(matched_skills, key=rank)[:k]
+    if not ranked:
+        return []
+
+    profiles = role_profiles_get(ranked, generation)
+    missing_profiles = [r for r in ranked if r not in profiles]
+    if missing_profiles:
+        fetched = fetch_profiles(missing_profiles)
+        role_profiles_set_many(fetched, generation)
+        profiles.update(fetched)
+
+    results = []
+    for role in ranked:
+        profile = profiles.get(role, {"description": "", "requires": [], "recommends_count": 0})
+        have = {normalize_skill(s) for s in matched_skills[role]}
+        results.append(
+            {
+                "role_name": role,
+                "description": profile["description"],
+                "match_score": len(matched_skills[role]),
+                "matched_skills": matched_skills[role],
+                "mandatory_coverage": coverage(required_hits[role], len(profile["requires"])),
+                "optional_coverage": coverage(optional_hits[role], profile["recommends_count"]),
+                "missing_skills": [
+                    s for s in profile["requires"] if normalize_skill(s) not in have
+                ],
+            }
+        )
+
+    return results
+
+
+def summarize_matches(matches: list[dict]) -> dict:
+    """
+    One cacheable tool result: the best role at the top level (what the graph
+    state and caches key on) plus the runners-up as alternatives.
+    """
+    best, *alternatives = matches
+    return {**best, "alternatives": alternatives}
+
+
+def match_roles_batch(batches: dict, k: int = ROLE_MATCH_TOP_K) -> dict:
+    """
+    match_roles for many skill sets: {batch_id: skills} -> {batch_id: top-k results}.
+    Everything is answered by one UNWIND $batches query, so call it per chunk.
+    """
+    return _batch_results(batches, run_read(BATCH_MATCH_QUERY, _batch_params(batches, k)))
+
+
+def _batch_params(batches: dict, k: int) -> dict:
+    return {
+        "batches": [
+            {"id": batch_id, "skill_norms": sorted({normalize_skill(s) for s in skills if s.strip()})}
+            for batch_id, skills in batches.items()
+        ],
+        "k": k,
+        "requires_weight": REQUIRES_WEIGHT,
+        "recommends_weight": RECOMMENDS_WEIGHT,
+    }
+
+
+def _batch_results(batches: dict, records: list[dict]) -> dict:
+    results = {batch_id: [] for batch_id in batches}
+    for record in records:
+        for match in record["matches"]:
+            have = {normalize_skill(s) for s in match["matched_skills"]}
+            results[record["id"]].append(
+                {
+                    "role_name": match["role_name"],
+                    "description": match["description"] or "",
+                    "match_score": len(match["matched_skills"]),
+                    "matched_skills": match["matched_skills"],
+                    "mandatory_coverage": coverage(match["required_hits"], len(match["requires"])),
+                    "optional_coverage": coverage(match["optional_hits"], match["recommends_count"]),
+                    "missing_skills": [
+                        s for s in match["requires"] if normalize_skill(s) not in have
+                    ],
+                }
+            )
+
+    return results
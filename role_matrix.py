@@ -0,0 +1,316 @@
+import os
+import time
+import threading
+import numpy as np
+from scipy import sparse
+
+from cache import get_ontology_generation
+from neo4j_client import run_read, normalize_skill
+from skill_closure import load_closure, current_closure
+
+
+# 'neo4j' queries the graph on every cache miss, 'matrix' answers in-process
+ROLE_MATCH_ENGINE = os.getenv("ROLE_MATCH_ENGINE", "neo4j")
+
+REQUIRES_WEIGHT = float(os.getenv("ROLE_MATRIX_REQUIRES_WEIGHT", "1.0"))
+RECOMMENDS_WEIGHT = float(os.getenv("ROLE_MATRIX_RECOMMENDS_WEIGHT", "1.0"))
+
+# How often the ontology generation counter in Redis is polled
+GENERATION_CHECK_SECONDS = float(os.getenv("ROLE_MATRIX_GENERATION_CHECK", "5"))
+
+ONTOLOGY_QUERY = """
+MATCH (r:Role)
+OPTIONAL MATCH (r)-[rel:REQUIRES|RECOMMENDS]->(s:Skill)
+RETURN r.name AS role, r.description AS description,
+       type(rel) AS rel_type, s.name AS skill
+"""
+
+
+def coverage(hits: float, total: int) -> float:
+    return round(float(hits) / total, 2) if total else 0.0
+
+
+class RoleSkillMatrix:
+    """
+    In-memory copy of the Role-Skill bipartite graph as two CSR matrices
+    (roles x skills), one for REQUIRES and one for RECOMMENDS.
+    Neo4j stays the source of truth; this is rebuilt on a generation bump.
+
+    With a skill closure (skill_closure.py), skills related to the user's
+    skills earn partial credit in the same matrix-vector product.
+    """
+
+    def __init__(self, closure=None, auto_refresh: bool = True):
+        self._lock = threading.Lock()
+        self._roles = {}  # role -> {"description", "requires": set, "recommends": set}
+        self._closure = closure  # (names, csr) from skill_closure.load_closure
+        self.auto_refresh = auto_refresh
+        self.generation = None
+        self._last_check = 0.0
+        self._build()
+
+    @classmethod
+    def from_roles(cls, roles: dict, closure=None):
+        """
+        Detached engine over an in-memory ontology (no Neo4j, no refresh).
+        roles: {name: {"description", "requires": iterable, "recommends": iterable}}
+        """
+        engine = cls(closure=closure, auto_refresh=False)
+        engine._roles = {
+            name: {
+                "description": entry.get("description", ""),
+                "requires": set(entry["requires"]),
+                "recommends": set(entry["recommends"]),
+            }
+            for name, entry in roles.items()
+        }
+        engine._build()
+        return engine
+
+    def load(self):
+        """
+        Full reload of the bipartite graph from Neo4j.
+        """
+        generation = get_ontology_generation()
+        records = run_read(ONTOLOGY_QUERY)
+        closure = self._closure
+        if self._closure is not None:
+            # The closure is derived from the same ontology: follow its generation too
+            closure = current_closure(generation)
+
+        roles = {}
+        for record in records:
+            entry = roles.setdefault(
+                record["role"],
+                {
+                    "description": record["description"],
+                    "requires": set(),
+                    "recommends": set(),
+                },
+            )
+            if record["skill"] is None:
+                continue
+            if record["rel_type"] == "REQUIRES":
+                entry["requires"].add(record["skill"])
+            else:
+                entry["recommends"].add(record["skill"])
+
+        with self._lock:
+            self._roles = roles
+            self._closure = closure
+            self._build()
+            self.generation = generation
+
+        print(
+            f"[ROLE MATRIX] Loaded {len(self.role_names)} roles x "
+            f"{len(self.skill_names)} skills (generation {generation})"
+        )
+
+    def upsert_role(
+        self,
+        role: str,
+        description: str,
+        requires: list[str],
+        recommends: list[str],
+    ):
+        """
+        Incremental update of a single role without a Neo4j round trip.
+        """
+        with self._lock:
+            self._roles[role] = {
+                "description": description,
+                "requires": set(requires),
+                "recommends": set(recommends),
+            }
+            self._build()
+
+    def remove_role(self, role: str):
+        with self._lock:
+            if self._roles.pop(role, None) is not None:
+                self._build()
+
+    def _build(self):
+        role_names = sorted(self._roles)
+        skill_names = sorted(
+            {
+                skill
+                for entry in self._roles.values()
+                for skill in entry["requires"] | entry["recommends"]
+            }
+        )
+        skill_index = {normalize_skill(name): i for i, name in enumerate(skill_names)}
+
+        def to_csr(kind: str):
+            rows, cols = [], []
+            for row, role in enumerate(role_names):
+                for skill in self._roles[role][kind]:
+                    rows.append(row)
+                    cols.append(skill_index[normalize_skill(skill)])
+            data = np.ones(len(rows), dtype=np.float32)
+            matrix = sparse.csr_matrix(
+                (data, (rows, cols)), shape=(len(role_names), len(skill_names))
+            )
+            matrix.data[:] = 1.0  # skills differing only in case were summed
+            return matrix
+
+        self.role_names = role_names
+        self.skill_names = skill_names
+        self.skill_index = skill_index
+        self.descriptions = [self._roles[r]["description"] for r in role_names]
+        self.requires = to_csr("requires")
+        self.recommends = to_csr("recommends")
+
+        if self._closure is not None:
+            closure_names, closure_matrix = self._closure
+            self.closure_index = {
+                normalize_skill(name): i for i, name in enumerate(closure_names)
+            }
+            # Re-index closure columns onto engine columns, dropping skills no role uses
+            columns = np.array(
+                [skill_index.get(normalize_skill(name), -1) for name in closure_names],
+                dtype=np.int64,
+            )
+            coo = closure_matrix.tocoo()
+            keep = columns[coo.col] >= 0
+            self.closure_matrix = sparse.csr_matrix(
+                (coo.data[keep], (coo.row[keep], columns[coo.col[keep]])),
+                shape=(len(closure_names), len(skill_names)),
+            )
+        else:
+            self.closure_index = {}
+            self.closure_matrix = None
+
+    def refresh_if_stale(self):
+        """
+        Reloads from Neo4j when insert_data.py bumped the ontology generation.
+        Polls Redis at most every GENERATION_CHECK_SECONDS.
+        """
+        now = time.time()
+        if not self.auto_refresh or now - self._last_check < GENERATION_CHECK_SECONDS:
+            return
+        self._last_check = now
+
+        try:
+            if get_ontology_generation() != self.generation:
+                self.load()
+        except Exception as e:
+            print(f"[ROLE MATRIX] Refresh failed, keeping current matrix: {e}")
+
+    def query_vector(self, skills: list[str]) -> np.ndarray:
+        vector = np.zeros(len(self.skill_names), dtype=np.float32)
+        for skill in skills:
+            column = self.skill_index.get(normalize_skill(skill))
+            if column is not None:
+                vector[column] = 1.0
+        return vector
+
+    def related_credit(self, skills: list[str]) -> np.ndarray | None:
+        """
+        Partial credit per engine column through the skill closure:
+        the best decay ** hops from any of the user's skills.
+        """
+        if self.closure_matrix is None:
+            return None
+
+        rows = [
+            self.closure_index[n]
+            for n in {normalize_skill(s) for s in skills}
+            if n in self.closure_index
+        ]
+        credit = np.zeros(len(self.skill_names), dtype=np.float32)
+        if not rows:
+            return credit
+
+        closure = self.closure_matrix
+        for row in rows:
+            start, end = closure.indptr[row], closure.indptr[row + 1]
+            np.maximum.at(credit, closure.indices[start:end], closure.data[start:end])
+        return credit
+
+    def top_k(self, skills: list[str], k: int = 1, use_closure: bool = True) -> list[dict]:
+        """
+        Top-k roles by (weighted) skill overlap, with matched and missing skills.
+        match_score is the raw overlap count, like the Cypher query; with a
+        closure loaded, related skills add partial credit to the ranking score.
+        """
+        self.refresh_if_stale()
+
+        with self._lock:
+            requires, recommends = self.requires, self.recommends
+            role_names, skill_names = self.role_names, self.skill_names
+            descriptions = self.descriptions
+            vector = self.query_vector(skills)
+            credit = self.related_credit(skills) if use_closure else None
+
+        if not role_names or not (vector.any() or (credit is not None and credit.any())):
+            return []
+
+        required_hits = requires @ vector
+        recommended_hits = recommends @ vector
+        match_count = required_hits + recommended_hits
+
+        scored = vector if credit is None else np.maximum(vector, credit)
+        weighted = REQUIRES_WEIGHT * (requires @ scored) + RECOMMENDS_WEIGHT * (
+            recommends @ scored
+        )
+
+        candidates = np.flatnonzero(weighted)
+        if candidates.size == 0:
+            return []
+
+        # Highest weighted score first, then raw count, then role name for stability
+        order = np.lexsort(
+            (candidates, -match_count[candidates], -weighted[candidates])
+        )
+        top = candidates[order[:k]]
+
+        results = []
+        for row in top:
+            req_cols = requires.indices[requires.indptr[row] : requires.indptr[row + 1]]
+            rec_cols = recommends.indices[
+                recommends.indptr[row] : recommends.indptr[row + 1]
+            ]
+            matched = [skill_names[c] for c in np.concatenate([req_cols, rec_cols]) if vector[c]]
+            missing = [skill_names[c] for c in req_cols if not vector[c]]
+
+            result = {
+                "role_name": role_names[row],
+                "description": descriptions[row],
+                "match_score": int(match_count[row]),
+                "matched_skills": matched,
+                "mandatory_coverage": coverage(required_hits[row], len(req_cols)),
+                "optional_coverage": coverage(recommended_hits[row], len(rec_cols)),
+                "missing_skills": missing,
+            }
+            if credit is not None:
+                result["related_skills"] = [
+                    skill_names[c]
+                    for c in np.concatenate([req_cols, rec_cols])
+                    if not vector[c] and credit[c] > 0
+                ]
+                result["weighted_score"] = round(float(weighted[row]), 3)
+            results.append(result)
+
+        return results
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_role_matrix() -> RoleSkillMatrix:
+    """
+    Process-wide engine, loaded from Neo4j on first use.
+    """
+    global _engine
+
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                closure = load_closure()
+                if closure is not None:
+                    print(f"[ROLE MATRIX] Using skill closure over {len(closure[0])} skills")
+                engine = RoleSkillMatrix(closure=closure)
+                engine.load()
+                _engine = engine
+    return _engine
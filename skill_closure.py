@@ -0,0 +1,168 @@
+import os
+import argparse
+from collections import defaultdict, deque
+
+import numpy as np
+from scipy import sparse
+
+from cache import get_ontology_generation
+from neo4j_client import run_read, normalize_skill
+
+
+# Read only by the matrix engine (ROLE_MATCH_ENGINE=matrix), not by match_roles
+SKILL_CLOSURE_PATH = os.getenv("SKILL_CLOSURE_PATH", "skill_closure.npz")
+
+# Credit for a skill reached through related skills: DECAY ** hops
+CLOSURE_DECAY = float(os.getenv("SKILL_CLOSURE_DECAY", "0.5"))
+CLOSURE_MAX_DEPTH = int(os.getenv("SKILL_CLOSURE_MAX_DEPTH", "2"))
+
+# Skill -> Skill edges only; Role -> Skill edges are the match itself
+RELATIONSHIPS_QUERY = """
+MATCH (a:Skill)-[rel]->(b:Skill)
+RETURN a.name AS source, b.name AS target, type(rel) AS rel_type
+"""
+
+
+def compute_closure(
+    edges: list[tuple[str, str]],
+    decay: float = CLOSURE_DECAY,
+    max_depth: int = CLOSURE_MAX_DEPTH,
+) -> tuple[list[str], sparse.csr_matrix]:
+    """
+    Bounded-depth weighted closure of the skill relationship graph.
+    Relationships are treated as undirected ("PyTorch IS_LIBRARY_OF Python"
+    says something about both). Entry [i, j] is decay ** (shortest hops i -> j),
+    for 1 <= hops <= max_depth.
+    """
+    neighbours = defaultdict(set)
+    names = {}
+    for source, target in edges:
+        a, b = normalize_skill(source), normalize_skill(target)
+        if a == b:
+            continue
+        names.setdefault(a, source)
+        names.setdefault(b, target)
+        neighbours[a].add(b)
+        neighbours[b].add(a)
+
+    ordered = sorted(names)
+    index = {norm: i for i, norm in enumerate(ordered)}
+
+    rows, cols, data = [], [], []
+    for start in ordered:
+        depth = {start: 0}
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            if depth[node] == max_depth:
+                continue
+            for nxt in neighbours[node]:
+                if nxt not in depth:
+                    depth[nxt] = depth[node] + 1
+                    queue.append(nxt)
+
+        for node, hops in depth.items():
+            if hops:
+                rows.append(index[start])
+                cols.append(index[node])
+                data.append(decay**hops)
+
+    matrix = sparse.csr_matrix(
+        (np.array(data, dtype=np.float32), (rows, cols)),
+        shape=(len(ordered), len(ordered)),
+    )
+    return [names[norm] for norm in ordered], matrix
+
+
+def save_closure(
+    names: list[str],
+    matrix: sparse.csr_matrix,
+    path: str = SKILL_CLOSURE_PATH,
+    generation: int = -1,
+):
+    # Written aside and moved into place, so a concurrent reader never sees half a file
+    partial = f"{path}.partial.npz"
+    np.savez_compressed(
+        partial,
+        names=np.array(names),
+        data=matrix.data,
+        indices=matrix.indices,
+        indptr=matrix.indptr,
+        shape=np.array(matrix.shape),
+        generation=np.array(generation),
+    )
+    os.replace(partial, path)
+
+
+def build_closure(
+    path: str = SKILL_CLOSURE_PATH,
+    decay: float = CLOSURE_DECAY,
+    max_depth: int = CLOSURE_MAX_DEPTH,
+) -> tuple[list[str], sparse.csr_matrix]:
+    """
+    Computes the closure from the current Neo4j relationships and saves it
+    with the ontology generation it was built from.
+    """
+    generation = get_ontology_generation()
+    records = run_read(RELATIONSHIPS_QUERY)
+    names, matrix = compute_closure(
+        [(r["source"], r["target"]) for r in records], decay, max_depth
+    )
+    save_closure(names, matrix, path, generation)
+    return names, matrix
+
+
+def _read(path: str):
+    data = np.load(path)
+    matrix = sparse.csr_matrix(
+        (data["data"], data["indices"], data["indptr"]), shape=tuple(data["shape"])
+    )
+    # Files written before generations were recorded count as stale
+    generation = int(data["generation"]) if "generation" in data.files else -1
+    return data["names"].tolist(), matrix, generation
+
+
+def load_closure(path: str = SKILL_CLOSURE_PATH):
+    """
+    Returns (names, csr matrix) or None if the offline job has not been run.
+    """
+    if not os.path.exists(path):
+        return None
+    names, matrix, _ = _read(path)
+    return names, matrix
+
+
+def current_closure(generation: int, path: str = SKILL_CLOSURE_PATH):
+    """
+    load_closure for the given ontology generation: a file built for an older
+    one is rebuilt from Neo4j first. None if the closure is not in use (no file).
+    """
+    if not os.path.exists(path):
+        return None
+    names, matrix, built_for = _read(path)
+    if built_for != generation:
+        print(f"[CLOSURE] Rebuilding for ontology generation {generation}")
+        names, matrix = build_closure(path)
+    return names, matrix
+
+
+if __name__ == "__main__":
+    from neo4j_client import close_driver
+
+    parser = argparse.ArgumentParser(
+        description="Precompute the weighted skill-relationship closure."
+    )
+    parser.add_argument("--depth", type=int, default=CLOSURE_MAX_DEPTH)
+    parser.add_argument("--decay", type=float, default=CLOSURE_DECAY)
+    parser.add_argument("--output", default=SKILL_CLOSURE_PATH)
+    args = parser.parse_args()
+
+    try:
+        skill_names, closure = build_closure(args.output, args.decay, args.depth)
+    finally:
+        close_driver()
+
+    print(
+        f"[OK] Closure over {len(skill_names)} related skills, "
+        f"{closure.nnz} weighted pairs (depth {args.depth}) saved to {args.output}"
+    )
@@ -0,0 +1,244 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+import numpy as np
+
+from cache import get_ontology_generation, skill_aliases_get, skill_aliases_set
+from metrics import CACHE_OPS
+from neo4j_client import run_read, normalize_skill
+
+
+SKILL_VECTORS_PATH = os.getenv("SKILL_VECTORS_PATH", "skill_vectors.npz")
+
+# Minimum cosine similarity for an extracted skill to be mapped onto an ontology skill
+CANONICAL_THRESHOLD = float(os.getenv("SKILL_CANONICAL_THRESHOLD", "0.75"))
+
+# Out-of-vocabulary skill vectors kept in memory (least recently used evicted first)
+OOV_CACHE_SIZE = int(os.getenv("SKILL_OOV_CACHE_SIZE", "4096"))
+# How often the ontology generation counter in Redis is polled
+GENERATION_CHECK_SECONDS = float(os.getenv("SKILL_VECTORS_GENERATION_CHECK", "5"))
+
+SKILLS_QUERY = "MATCH (s:Skill) RETURN s.name AS name ORDER BY name"
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def build_skill_table(embedding_model, path: str = SKILL_VECTORS_PATH):
+    """
+    Embeds every Skill.name of the ontology in one batch and saves the matrix
+    with its name index and the ontology generation it was built from.
+    """
+    generation = get_ontology_generation()
+    names = [record["name"] for record in run_read(SKILLS_QUERY) if record["name"]]
+    print(f"Embedding {len(names)} ontology skills...")
+
+    matrix = np.array(embedding_model.embed_documents(names), dtype=np.float32)
+    # Written aside and moved into place, so a concurrent reader never sees half a file
+    partial = f"{path}.partial.npz"
+    np.savez_compressed(
+        partial,
+        names=np.array(names),
+        matrix=_normalize_rows(matrix),
+        generation=np.array(generation),
+    )
+    os.replace(partial, path)
+    print(f"[OK] Skill vectors saved to {path} (generation {generation})")
+
+
+class SkillVectorTable:
+    """
+    Per-skill embeddings held as a NumPy matrix with a name_norm -> row index.
+    Skill-set vectors are mean-pooled from member rows; only out-of-vocabulary
+    skills need the model, and those are memoized in a bounded LRU.
+    """
+
+    def __init__(
+        self,
+        names: list[str],
+        matrix: np.ndarray,
+        embedding_model,
+        generation: int = -1,
+    ):
+        self.names = list(names)
+        self.matrix = matrix.astype(np.float32)
+        self.index = {normalize_skill(name): row for row, name in enumerate(self.names)}
+        self.embedding_model = embedding_model
+        self.generation = generation
+        self._oov = OrderedDict()
+        self._oov_lock = threading.Lock()
+
+    @classmethod
+    def load(cls, embedding_model, path: str = SKILL_VECTORS_PATH):
+        data = np.load(path)
+        # Files written before generations were recorded count as stale
+        generation = int(data["generation"]) if "generation" in data.files else -1
+        return cls(data["names"].tolist(), data["matrix"], embedding_model, generation)
+
+    def vectors(self, skills: list[str]) -> np.ndarray:
+        """
+        One row per skill. Out-of-vocabulary skills are embedded in a single
+        batched model call and memoized.
+        """
+        norms = [normalize_skill(s) for s in skills]
+        with self._oov_lock:
+            known = {}
+            for n in norms:
+                if n in self._oov:
+                    self._oov.move_to_end(n)
+                    known[n] = self._oov[n]
+
+        missing = {}
+        for skill, norm in zip(skills, norms):
+            if norm in self.index or norm in known:
+                CACHE_OPS.labels(method="skill_vector", status="hit").inc()
+            elif norm not in missing:
+                CACHE_OPS.labels(method="skill_vector", status="miss").inc()
+                missing[norm] = skill.strip()
+
+        if missing:
+            embedded = _normalize_rows(
+                np.array(
+                    self.embedding_model.embed_documents(list(missing.values())),
+                    dtype=np.float32,
+                )
+            )
+            new_vectors = dict(zip(missing, embedded))
+            with self._oov_lock:
+                self._oov.update(new_vectors)
+                while len(self._oov) > OOV_CACHE_SIZE:
+                    self._oov.popitem(last=False)
+            known.update(new_vectors)
+
+        return np.stack(
+            [self.matrix[self.index[n]] if n in self.index else known[n] for n in norms]
+        )
+
+    def compose(self, skills: list[str]) -> list[float]:
+        """
+        Query vector for a skill set: L2-normalized mean of the member vectors.
+        Order- and duplicate-insensitive, like the set it represents.
+        """
+        unique = {normalize_skill(s): s for s in skills if s.strip()}
+        if not unique:
+            return self.embedding_model.embed_query("")
+
+        pooled = self.vectors(list(unique.values())).mean(axis=0)
+        pooled /= np.linalg.norm(pooled) or 1.0
+        return pooled.tolist()
+
+    def canonical_names(self, skills: list[str]) -> dict:
+        """
+        name_norm -> ontology spelling for every skill given ("postgres" -> "PostgreSQL").
+        Known names map directly, resolved aliases come from Redis, and the rest
+        go through one vectorized nearest-neighbour lookup over the skill matrix.
+        Skills without a close enough neighbour map to ''.
+        """
+        originals = {normalize_skill(s): s.strip() for s in skills if s and s.strip()}
+
+        resolved = {n: self.names[self.index[n]] for n in originals if n in self.index}
+
+        unknown = sorted(n for n in originals if n not in resolved)
+        aliases = skill_aliases_get(unknown)
+
+        to_search = [n for n in unknown if n not in aliases]
+        if to_search and len(self.names):
+            queries = self.vectors([originals[n] for n in to_search])
+
+            similarities = queries @ self.matrix.T
+            best = similarities.argmax(axis=1)
+            best_scores = similarities[np.arange(len(to_search)), best]
+
+            new_aliases = {}
+            for norm, row, score in zip(to_search, best, best_scores):
+                canonical = self.names[row] if score >= CANONICAL_THRESHOLD else ""
+                if canonical:
+                    print(f"[CANONICAL] '{originals[norm]}' -> '{canonical}' ({score:.2f})")
+                new_aliases[norm] = canonical
+            skill_aliases_set(new_aliases)
+            aliases.update(new_aliases)
+
+        return {n: resolved.get(n) or aliases.get(n, "") for n in originals}
+
+    def canonicalize(self, skills: list[str], names: dict | None = None) -> list[str]:
+        """
+        Maps each skill to its ontology spelling, keeping unmatched skills as given.
+        `names` is a canonical_names() result to reuse across many skill lists.
+        """
+        cleaned = [s.strip() for s in skills if s and s.strip()]
+        if names is None:
+            names = self.canonical_names(cleaned)
+
+        canonical_skills = []
+        for skill in cleaned:
+            name = names.get(normalize_skill(skill)) or skill
+            if name not in canonical_skills:
+                canonical_skills.append(name)
+        return canonical_skills
+
+
+_table = None
+_table_lock = threading.Lock()
+_last_check = 0.0
+
+
+def _load_current(embedding_model, generation: int) -> SkillVectorTable:
+    """
+    The table file, rebuilt from Neo4j first if it is missing or older than
+    generation (another replica may already have rebuilt it).
+    """
+    table = None
+    if os.path.exists(SKILL_VECTORS_PATH):
+        table = SkillVectorTable.load(embedding_model)
+    if table is None or table.generation != generation:
+        build_skill_table(embedding_model)
+        table = SkillVectorTable.load(embedding_model)
+    return table
+
+
+def get_skill_table(embedding_model) -> SkillVectorTable:
+    """
+    Process-wide table. Built from Neo4j on first use if the file is missing,
+    and reloaded (rebuilt if needed) when insert_data.py bumps the ontology
+    generation; Redis is polled at most every GENERATION_CHECK_SECONDS.
+    """
+    global _table, _last_check
+
+    if _table is not None and time.time() - _last_check < GENERATION_CHECK_SECONDS:
+        return _table
+
+    with _table_lock:
+        _last_check = time.time()
+        try:
+            generation = get_ontology_generation()
+            table = None
+            if _table is None or _table.generation != generation:
+                table = _load_current(embedding_model, generation)
+        except Exception as e:
+            if _table is None:
+                raise
+            print(f"[SKILL VECTORS] Refresh failed, keeping current table: {e}")
+            return _table
+
+        if table is not None:
+            if _table is not None:
+                # OOV vectors depend only on the model, not on the ontology
+                table._oov, table._oov_lock = _table._oov, _table._oov_lock
+            _table = table
+            print(
+                f"Skill vectors loaded: {len(_table.names)} skills "
+                f"(generation {generation})."
+            )
+    return _table
+
+
+if __name__ == "__main__":
+    from langchain_huggingface import HuggingFaceEmbeddings
+
+    build_skill_table(
+        HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
+    )
@@ -18,6 +18,22 @@ embedding_model = HuggingFaceEmbeddings(
 )
 
 
+def job_embedding_text(job: dict) -> str:
+    """
+    Weighted text used for the job_postings `embedding` field.
+    """
+    title = job.get("job_title", "")
+    desc = job.get("job_description", "") or job.get("description", "")
+    loc = job.get("location", "Unknown")
+    exp = job.get("experience_level", "Unknown")
+
+    return (
+        f"Location: {loc}. Experience: {exp}. Title: {title}. "
+        f"Job for {title} in {loc} ({exp}). "
+        f"Description: {desc}"
+    )
+
+
 def vectorize_jobs_weighted():
     client = MongoClient(MONGO_CONNECTION_STRING)
     collection = client[MONGO_DB][COLLECTION_NAME]
@@ -29,15 +45,7 @@ def vectorize_jobs_weighted():
     count = 0
     for job in jobs:
         title = job.get("job_title", "")
-        desc = job.get("job_description", "") or job.get("description", "")
-        loc = job.get("location", "Unknown")
-        exp = job.get("experience_level", "Unknown")
-
-        text_to_embed = (
-            f"Location: {loc}. Experience: {exp}. Title: {title}. "
-            f"Job for {title} in {loc} ({exp}). "
-            f"Description: {desc}"
-        )
+        text_to_embed = job_embedding_text(job)
 
         vector = embedding_model.embed_query(text_to_embed)
 